@@ -12,5 +12,9 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+# Warm the API caches before this worker takes traffic (see /api/ready/)
+os.environ.setdefault('DJANGO_API_WARMUP_ON_START', '1')
+# Route the read-only API to its async views in this process
+os.environ.setdefault('DJANGO_API_ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
@@ -79,12 +79,16 @@ CORS_ALLOWED_ORIGINS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.ReplicaMiddleware',
+    'core.middleware.ApiCacheControlMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Last, so its view time covers only the view
+    'core.middleware.ServerTimingMiddleware',
 ]
 
 ROOT_URLCONF = 'backend.urls'
@@ -116,15 +120,55 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.mysql',
+        # django.db.backends.mysql with a per-process connection pool, see
+        # core/backends/pool.py. Connections go back to the pool at the end
+        # of each request (CONN_MAX_AGE = 0) instead of being closed.
+        'ENGINE': 'core.backends.mysql',
         'NAME': 'flowhcm_db',
         'USER': 'root',
         'PASSWORD': '',
         'HOST': 'localhost',
         'PORT': '3306',
+        'CONN_MAX_AGE': 0,
+        'CONN_HEALTH_CHECKS': True,
+        # MAX_SIZE bounds the connections of one process; async views use up
+        # to API_SECTION_CONCURRENCY per request (see below).
+        'POOL': {
+            'MAX_SIZE': 10,
+            'TIMEOUT': 5,
+            'MAX_LIFETIME': 3600,
+            'HEALTH_CHECK_AFTER': 30,
+        },
     }
 }
 
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/ref/settings/#caches
+#
+# Required in production: every worker must share this cache. It holds the
+# change stamps (core/versions.py) that cached payloads, singletons and ETags
+# are checked against; with a per-process cache an admin save would only
+# reach the worker that handled it (the core.W001 deploy check reports it).
+# Set DJANGO_REDIS_URL (needs the redis package); without it, e.g. in local
+# development, each process gets its own LocMemCache. If the cache goes
+# down, payloads are rebuilt per request instead of failing.
+
+if os.environ.get('DJANGO_REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['DJANGO_REDIS_URL'],
+            'KEY_PREFIX': 'flowhcm',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -167,4 +211,84 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 ADMIN_SITE_CONFIG = {
     'ENABLE_NAV_SIDEBAR': False,
-}
\ No newline at end of file
+}
+
+# Static JSON snapshots of the public API (see core/snapshots.py).
+# When enabled, committed content changes republish the affected snapshots
+# in the background, batched over API_SNAPSHOT_DELAY seconds;
+# `manage.py publish_snapshots` does the same on demand.
+API_SNAPSHOTS_ENABLED = False
+API_SNAPSHOT_ROOT = BASE_DIR / 'snapshots'
+API_SNAPSHOT_DELAY = 1.0
+
+# Resized WebP/AVIF/JPEG variants of uploaded images (see core/images.py)
+IMAGE_DERIVATIVES_ENABLED = True
+IMAGE_DERIVATIVE_WIDTHS = (64, 128, 256, 512, 1024)
+
+# Contact form ingestion (see contact/ingest.py): 'sync' writes each message
+# in the request, 'buffered' queues it and inserts in batches.
+CONTACT_INGEST_MODE = 'sync'
+CONTACT_INGEST_MAX_QUEUE = 1000
+CONTACT_INGEST_BATCH_SIZE = 100
+CONTACT_INGEST_FLUSH_INTERVAL = 1.0
+CONTACT_INGEST_DEAD_LETTER = BASE_DIR / 'contact_dead_letter.jsonl'
+
+# Contact form throttling (see contact/throttle.py): token buckets as
+# (burst, seconds) per scope, and a window for dropping identical resubmits.
+# Use the 'cache' backend with a shared cache when running several workers.
+CONTACT_THROTTLE_BACKEND = 'memory'
+CONTACT_THROTTLE_MAX_KEYS = 10000
+CONTACT_THROTTLE_LIMITS = {'ip': (5, 60), 'email': (3, 300)}
+CONTACT_DEDUPE_WINDOW = 600
+# Addresses/CIDR networks of the proxies in front of Django (e.g. the caching
+# proxy); requests from them are keyed by the client in X-Forwarded-For.
+TRUSTED_PROXIES = []
+
+# `manage.py archive_contact_messages` moves read messages older than this
+CONTACT_ARCHIVE_AFTER_DAYS = 180
+
+# Serve the read-only API with its async views (see core.views.api_view).
+# backend/asgi.py turns this on for processes started under uvicorn/daphne.
+API_ASYNC_VIEWS = os.environ.get('DJANGO_API_ASYNC_VIEWS') == '1'
+# Sections of one async request (/api/hardware/, /api/home/) queried at once,
+# each on its own pooled connection: keep POOL['MAX_SIZE'] at least this
+# times the requests a worker serves concurrently.
+API_SECTION_CONCURRENCY = 2
+
+# Read replicas for anonymous API reads: {alias: weight}, every alias also
+# configured in DATABASES. Writes and the admin always use 'default'.
+DATABASE_REPLICAS = {}
+# Seconds after a content change during which all reads stay on the primary
+DATABASE_REPLICA_LAG = 5
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+# Share of requests timed by core.middleware.ServerTimingMiddleware (0 turns
+# it off), and whether timed responses carry the Server-Timing header.
+SERVER_TIMING_SAMPLE_RATE = 1.0
+SERVER_TIMING_HEADER = True
+
+# POST /api/batch/: most sub-requests per batch, seconds the whole batch may
+# take, and worker threads shared by all batches of a process.
+API_BATCH_MAX_REQUESTS = 20
+API_BATCH_TIMEOUT = 5.0
+API_BATCH_WORKERS = 8
+
+# Cache-Control of cacheable API responses: browsers revalidate (ETag), the
+# proxy keeps them until a tag purge (see core/purge.py). Without
+# API_PURGE_URL nothing would tell the proxy about changes, so it gets the
+# short one; so do responses that differ per request (the home client strip).
+API_CACHE_CONTROL = 'public, max-age=0, s-maxage=86400'
+API_SHORT_CACHE_CONTROL = 'public, max-age=0, s-maxage=60'
+# Tag purges after content changes. Unset API_PURGE_URL to send none; e.g.
+# Fastly: 'https://api.fastly.com/service/<id>/purge' with
+# API_PURGE_HEADERS = {'Fastly-Key': '...'}.
+API_PURGE_URL = os.environ.get('DJANGO_API_PURGE_URL')
+API_PURGE_METHOD = 'POST'
+API_PURGE_TAG_HEADER = 'Surrogate-Key'
+API_PURGE_HEADERS = {}
+API_PURGE_DELAY = 0.5
+
+# Build the cached API payloads in the background when a worker starts (set
+# by wsgi.py/asgi.py, so management commands don't); /api/ready/ returns 503
+# until it is done.
+API_WARMUP_ON_START = os.environ.get('DJANGO_API_WARMUP_ON_START') == '1'
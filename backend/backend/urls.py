@@ -10,6 +10,7 @@ urlpatterns = [
     path('', include('contact.urls')),
     path('', include('home.urls')),
     path('', include('hardware.urls')),
+    path('', include('core.urls')),
 
 
 
@@ -12,5 +12,7 @@ import os
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+# Warm the API caches before this worker takes traffic (see /api/ready/)
+os.environ.setdefault('DJANGO_API_WARMUP_ON_START', '1')
 
 application = get_wsgi_application()
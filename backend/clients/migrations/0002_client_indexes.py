@@ -0,0 +1,21 @@
+# Generated by Django 4.2.28 on 2026-10-18 12:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['is_active', 'category', 'order', 'name'], name='client_cat_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['is_active', 'order', 'name'], name='client_active_order_idx'),
+        ),
+    ]
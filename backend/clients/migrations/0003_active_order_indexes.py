@@ -0,0 +1,17 @@
+# Generated by Django 4.2.28 on 2026-10-18 12:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0002_client_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['is_active', 'order', 'name'], name='category_active_order_idx'),
+        ),
+    ]
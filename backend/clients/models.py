@@ -8,6 +8,7 @@ class Category(models.Model):
     class Meta:
         verbose_name_plural = "Categories"
         ordering = ['order', 'name']
+        indexes = [models.Index(fields=['is_active', 'order', 'name'], name='category_active_order_idx')]
 
     def __str__(self):
         return self.name
@@ -23,6 +24,11 @@ class Client(models.Model):
 
     class Meta:
         ordering = ['order', 'name']
+        indexes = [
+            # Keyset pagination over (order, name, id); InnoDB appends the pk
+            models.Index(fields=['is_active', 'category', 'order', 'name'], name='client_cat_order_idx'),
+            models.Index(fields=['is_active', 'order', 'name'], name='client_active_order_idx'),
+        ]
 
     def __str__(self):
         return self.name
\ No newline at end of file
@@ -0,0 +1,38 @@
+import random
+
+from core import versions
+from core.http import attach_media, dumps
+from core.models import ImageDerivative
+from .models import Client
+
+
+class ClientPool:
+    """
+    In-memory pool of active client logos for random sampling.
+
+    Replaces ``order_by('?')`` (ORDER BY RAND() on MySQL, a full scan and
+    sort per request). Entries are kept pre-serialized, so a draw costs
+    O(k) and no queries; the pool reloads once the Client stamp moves.
+    """
+
+    def __init__(self):
+        self.stamp = None
+        self.entries = ()
+
+    def refresh(self):
+        stamp = versions.get_versions([Client, ImageDerivative])
+        if stamp == self.stamp:
+            return
+        rows = list(Client.objects.filter(is_active=True).values('name', 'logo'))
+        self.entries = tuple(dumps(client) for client in attach_media(rows, 'logo'))
+        self.stamp = stamp
+
+    def sample_json(self, k):
+        """Return a JSON array of up to ``k`` distinct random clients."""
+        self.refresh()
+        entries = self.entries
+        picked = random.sample(entries, min(k, len(entries)))
+        return b'[' + b','.join(picked) + b']'
+
+
+client_pool = ClientPool()
@@ -1,3 +1,71 @@
+import json
+
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+
+from .models import Category, Client
+from .sampler import ClientPool
+
+
+class ClientPoolTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for i in range(10):
+            Client.objects.create(name=f"Client {i}", order=i)
+        Client.objects.create(name="Hidden", is_active=False)
+        self.pool = ClientPool()
+
+    def test_sample_draws_distinct_active_clients(self):
+        names = [c['name'] for c in json.loads(self.pool.sample_json(6))]
+        self.assertEqual(len(names), 6)
+        self.assertEqual(len(set(names)), 6)
+        self.assertNotIn("Hidden", names)
+
+    def test_sample_is_capped_by_pool_size(self):
+        self.assertEqual(len(json.loads(self.pool.sample_json(50))), 10)
+
+    def test_sample_runs_no_queries_once_loaded(self):
+        self.pool.sample_json(6)
+        with self.assertNumQueries(0):
+            self.pool.sample_json(6)
+
+    def test_pool_reloads_after_client_change(self):
+        self.pool.sample_json(6)
+        with self.captureOnCommitCallbacks(execute=True):
+            Client.objects.filter(is_active=True).update(is_active=False)
+            Client.objects.create(name="Fresh")
+        self.assertEqual(json.loads(self.pool.sample_json(6)), [
+            {'name': "Fresh", 'logo': None, 'logo_srcset': None},
+        ])
+
+
+class ClientPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Banking")
+        for i in range(7):
+            Client.objects.create(name=f"Client {i}", order=i % 3, category=self.category)
+        Client.objects.create(name="Other", order=0)
+        self.url = reverse('client-list')
+
+    def test_walks_all_pages_in_order(self):
+        names, cursor = [], None
+        while True:
+            params = {'limit': 3, 'category': self.category.id}
+            if cursor:
+                params['cursor'] = cursor
+            page = self.client.get(self.url, params).json()
+            names += [c['name'] for c in page['results']]
+            cursor = page['next']
+            if not cursor:
+                break
+        expected = Client.objects.filter(category=self.category).order_by('order', 'name', 'id')
+        self.assertEqual(names, [c.name for c in expected])
+
+    def test_unpaginated_request_returns_plain_list(self):
+        self.assertEqual(len(self.client.get(self.url).json()), 8)
 
-# Create your tests here.
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
@@ -1,7 +1,8 @@
 from django.urls import path
+from core.views import api_view
 from . import views
 
 urlpatterns = [
-    path('api/categories/', views.CategoryListView.as_view(), name='category-list'),
-    path('api/clients/', views.ClientListView.as_view(), name='client-list'),
-]
\ No newline at end of file
+    path('api/categories/', api_view(views.CategoryListView, views.CategoryListAsyncView), name='category-list'),
+    path('api/clients/', api_view(views.ClientListView, views.ClientListAsyncView), name='client-list'),
+]
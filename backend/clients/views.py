@@ -1,29 +1,136 @@
-from django.http import JsonResponse
+import base64
+import binascii
+import json
+from asgiref.sync import sync_to_async
+from django.db.models import Q
+from django.http import HttpResponse
+from core.cache import acached_json, cached_json
+from core.http import JsonResponse, attach_media
 from django.views import View
+from core.models import ImageDerivative
+from core.views import ConditionalGetMixin
 from .models import Category, Client
 
-class CategoryListView(View):
+class CategoryListView(ConditionalGetMixin, View):
+    depends_on = (Category,)
+    payload_name = 'categories'
+
     def get(self, request):
-        categories = Category.objects.filter(is_active=True).order_by('order', 'name')
-        data = [{'id': cat.id, 'name': cat.name} for cat in categories]
-        return JsonResponse(data, safe=False)
+        body = cached_json(self.payload_name, self.depends_on, lambda: list(self.get_queryset()))
+        return HttpResponse(body, content_type='application/json')
+
+    def get_queryset(self):
+        return Category.objects.filter(is_active=True).order_by('order', 'name').values('id', 'name')
+
+class CategoryListAsyncView(CategoryListView):
+    async def get(self, request):
+        body = await acached_json(self.payload_name, self.depends_on, self.abuild)
+        return HttpResponse(body, content_type='application/json')
+
+    async def abuild(self):
+        return [row async for row in self.get_queryset()]
+
+def encode_cursor(row):
+    raw = json.dumps([row['order'], row['name'], row['id']]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+    order, name, pk = json.loads(raw)
+    return int(order), str(name), int(pk)
+
+
+class ClientListView(ConditionalGetMixin, View):
+    """
+    Active clients, optionally filtered by ``?category=``.
+
+    With ``?limit=`` (and the ``next`` cursor of the previous page as
+    ``?cursor=``) the list is paginated by keyset over (order, name, id), so
+    every page is an index range scan no matter how deep. Without them the
+    whole list is returned as before.
+    """
+    depends_on = (Client, ImageDerivative)
+    default_limit = 50
+    max_limit = 200
+    # Only the full, unfiltered list is cached
+    payload_name = 'clients'
+    params = ('category', 'limit', 'cursor')
 
-class ClientListView(View):
     def get(self, request):
+        if not any(param in request.GET for param in self.params):
+            body = cached_json(self.payload_name, self.depends_on, lambda: self.build(request))
+            return HttpResponse(body, content_type='application/json')
+        try:
+            clients, limit = self.get_queryset(request)
+        except ValueError:
+            return JsonResponse({'error': 'Invalid cursor or limit'}, status=400)
+        return self.render(*self.paginate(list(clients), limit))
+
+    def build(self, request):
+        clients, limit = self.get_queryset(request)
+        rows, limit, next_cursor = self.paginate(list(clients), limit)
+        return attach_media(rows, 'logo')
+
+    def get_queryset(self, request):
+        """The clients to list and the page size (None when not paginated)."""
         category_id = request.GET.get('category')
-        clients = Client.objects.filter(is_active=True).order_by('order', 'name')
+        clients = (Client.objects.filter(is_active=True).order_by('order', 'name', 'id')
+                   .values('id', 'name', 'logo', 'category_id', 'order'))
         if category_id:
             clients = clients.filter(category_id=category_id)
-        data = []
-        for client in clients:
-            data.append({
-                'id': client.id,
-                'name': client.name,
-                'logo': client.logo.url if client.logo else None,
-                'category_id': client.category.id if client.category else None,
-            })
+
+        if 'limit' not in request.GET and 'cursor' not in request.GET:
+            return clients, None
+        try:
+            limit = min(int(request.GET.get('limit', self.default_limit)), self.max_limit)
+            cursor = request.GET.get('cursor')
+            if cursor:
+                order, name, pk = decode_cursor(cursor)
+                clients = clients.filter(
+                    Q(order__gt=order)
+                    | Q(order=order, name__gt=name)
+                    | Q(order=order, name=name, id__gt=pk)
+                )
+        except (TypeError, binascii.Error) as e:
+            raise ValueError(e)
+        if limit < 1:
+            raise ValueError(limit)
+        # One extra row tells whether there is a next page
+        return clients[:limit + 1], limit
+
+    def paginate(self, rows, limit):
+        """The rows of this page and the cursor of the next one."""
+        has_next = limit is not None and len(rows) > limit
+        if has_next:
+            rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]) if has_next else None
+        for row in rows:
+            del row['order']
+        return rows, limit, next_cursor
+
+    def render(self, rows, limit, next_cursor):
+        data = attach_media(rows, 'logo')
+        if limit is not None:
+            return JsonResponse({'results': data, 'next': next_cursor})
         return JsonResponse(data, safe=False)
 
+class ClientListAsyncView(ClientListView):
+    async def get(self, request):
+        if not any(param in request.GET for param in self.params):
+            body = await acached_json(self.payload_name, self.depends_on, lambda: self.abuild(request))
+            return HttpResponse(body, content_type='application/json')
+        try:
+            clients, limit = self.get_queryset(request)
+        except ValueError:
+            return JsonResponse({'error': 'Invalid cursor or limit'}, status=400)
+        rows, limit, next_cursor = self.paginate([row async for row in clients], limit)
+        return await sync_to_async(self.render)(rows, limit, next_cursor)
+
+    async def abuild(self, request):
+        clients, limit = self.get_queryset(request)
+        rows, limit, next_cursor = self.paginate([row async for row in clients], limit)
+        return await sync_to_async(attach_media)(rows, 'logo')
 
         # myapp/views.py
 
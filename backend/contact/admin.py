@@ -1,6 +1,10 @@
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponseBadRequest
+from django.urls import path
 from unfold.admin import ModelAdmin  # Import the Unfold version
-from .models import ContactInfo, ContactMessage
+from .export import FORMATS, filter_messages, stream_export
+from .models import ArchivedContactMessage, ContactInfo, ContactMessage
 
 @admin.register(ContactInfo)
 class ContactInfoAdmin(ModelAdmin): # Changed to Unfold ModelAdmin
@@ -17,9 +21,57 @@ class ContactMessageAdmin(ModelAdmin): # Changed to Unfold ModelAdmin
     list_display = ['name', 'email', 'subject', 'created_at', 'is_read']
     list_filter = ['is_read', 'created_at']
     search_fields = ['name', 'email', 'subject']
-    actions = ['mark_as_read']
+    actions = ['mark_as_read', 'export_csv', 'export_ndjson']
+
+    def get_urls(self):
+        return [
+            path(
+                'export/',
+                self.admin_site.admin_view(self.export_view),
+                name='contact_contactmessage_export',
+            ),
+        ] + super().get_urls()
+
+    def export_view(self, request):
+        """
+        Stream all messages as ?format=csv|ndjson, optionally filtered by
+        ?is_read=0|1, ?since= and ?until= (ISO dates).
+        """
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        fmt = request.GET.get('format', 'csv')
+        if fmt not in FORMATS:
+            return HttpResponseBadRequest("Unknown format")
+        try:
+            queryset = filter_messages(ContactMessage.objects.all(), request.GET)
+        except ValueError as e:
+            return HttpResponseBadRequest(str(e))
+        return stream_export(queryset, fmt)
 
     # Custom Unfold styling for the action button
     @admin.action(description="Mark selected messages as read")
     def mark_as_read(self, request, queryset):
-        queryset.update(is_read=True)
\ No newline at end of file
+        queryset.update(is_read=True)
+
+    @admin.action(description="Export selected messages as CSV")
+    def export_csv(self, request, queryset):
+        return stream_export(queryset, 'csv')
+
+    @admin.action(description="Export selected messages as NDJSON")
+    def export_ndjson(self, request, queryset):
+        return stream_export(queryset, 'ndjson')
+
+@admin.register(ArchivedContactMessage)
+class ArchivedContactMessageAdmin(ModelAdmin):
+    list_display = ['name', 'email', 'subject', 'created_at', 'month']
+    list_filter = ['month']
+    search_fields = ['name', 'email', 'subject']
+    date_hierarchy = 'month'
+    # The archive grows without bound; skip the unfiltered COUNT(*)
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
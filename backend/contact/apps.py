@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ContactConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'contact'
+
+    def ready(self):
+        from core import versions
+        from .models import ContactInfo
+        versions.track(ContactInfo)
@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ArchivedContactMessage, ContactMessage
+
+
+def archive_messages(older_than_days=180, batch_size=1000, limit=None):
+    """
+    Move read messages older than ``older_than_days`` into
+    ArchivedContactMessage, ``batch_size`` rows per transaction so the hot
+    table is never locked for long. Returns the number of moved messages.
+    """
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    moved = 0
+    while limit is None or moved < limit:
+        size = batch_size if limit is None else min(batch_size, limit - moved)
+        with transaction.atomic():
+            batch = list(
+                ContactMessage.objects
+                .filter(is_read=True, created_at__lt=cutoff)
+                .order_by('created_at')
+                .select_for_update()[:size]
+            )
+            if not batch:
+                break
+            ArchivedContactMessage.objects.bulk_create([
+                ArchivedContactMessage(
+                    original_id=m.id,
+                    name=m.name,
+                    email=m.email,
+                    subject=m.subject,
+                    message=m.message,
+                    created_at=m.created_at,
+                    is_read=m.is_read,
+                    month=m.created_at.date().replace(day=1),
+                )
+                for m in batch
+            ], ignore_conflicts=True)
+            ContactMessage.objects.filter(id__in=[m.id for m in batch]).delete()
+        moved += len(batch)
+    return moved
@@ -0,0 +1,135 @@
+"""
+Buffered ingestion of contact form submissions.
+
+In ``CONTACT_INGEST_MODE = 'buffered'`` the view validates a message, hands
+it to a bounded in-process queue and answers 202 right away. A writer thread
+inserts queued messages with bulk_create once ``CONTACT_INGEST_BATCH_SIZE``
+are waiting or ``CONTACT_INGEST_FLUSH_INTERVAL`` seconds passed. A full queue
+makes ``submit()`` refuse (the view answers 503), the queue is drained on
+interpreter exit, and a batch that still fails after a retry is appended to
+``CONTACT_INGEST_DEAD_LETTER`` as JSON lines so it can be replayed.
+"""
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .models import ContactMessage
+
+logger = logging.getLogger(__name__)
+
+
+class MessageBuffer:
+    def __init__(self, max_size=1000, batch_size=100, flush_interval=1.0, dead_letter=None):
+        self.queue = queue.Queue(max_size)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dead_letter = dead_letter
+        self.stats = Counter()
+        self.stopping = threading.Event()
+        self.write_lock = threading.Lock()
+        self.thread = None
+
+    def submit(self, message):
+        """Queue an unsaved ContactMessage; False if the buffer is full."""
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            self.stats['rejected'] += 1
+            return False
+        self.stats['accepted'] += 1
+        return True
+
+    def take(self, timeout):
+        """Collect up to batch_size messages, waiting at most ``timeout``."""
+        batch = []
+        deadline = time.monotonic() + timeout
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self.queue.get(timeout=remaining))
+                else:
+                    batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def write(self, batch):
+        with self.write_lock:
+            for attempt in range(2):
+                try:
+                    ContactMessage.objects.bulk_create(batch)
+                    self.stats['written'] += len(batch)
+                    return
+                except Exception:
+                    logger.exception("Writing %d contact messages failed", len(batch))
+                    close_old_connections()
+            self.stats['failed'] += len(batch)
+            self.save_dead_letter(batch)
+
+    def save_dead_letter(self, batch):
+        if not self.dead_letter:
+            logger.error("Dropped %d contact messages, no dead letter file set", len(batch))
+            return
+        with open(self.dead_letter, 'a', encoding='utf-8') as f:
+            for m in batch:
+                f.write(json.dumps({
+                    'name': m.name, 'email': m.email,
+                    'subject': m.subject, 'message': m.message,
+                }) + '\n')
+        logger.error("Saved %d unwritten contact messages to %s", len(batch), self.dead_letter)
+
+    def flush(self):
+        """Write everything queued so far from the calling thread."""
+        while True:
+            batch = self.take(0)
+            if not batch:
+                return
+            self.write(batch)
+
+    def run(self):
+        while not self.stopping.is_set():
+            batch = self.take(self.flush_interval)
+            if batch:
+                self.write(batch)
+                close_old_connections()
+        self.flush()
+        close_old_connections()
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name='contact-ingest', daemon=True)
+            self.thread.start()
+            atexit.register(self.stop)
+
+    def stop(self, timeout=10):
+        """Stop the writer and drain what is left in the queue."""
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+        self.flush()
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer():
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None:
+            _buffer = MessageBuffer(
+                max_size=getattr(settings, 'CONTACT_INGEST_MAX_QUEUE', 1000),
+                batch_size=getattr(settings, 'CONTACT_INGEST_BATCH_SIZE', 100),
+                flush_interval=getattr(settings, 'CONTACT_INGEST_FLUSH_INTERVAL', 1.0),
+                dead_letter=getattr(settings, 'CONTACT_INGEST_DEAD_LETTER', None),
+            )
+            _buffer.start()
+    return _buffer
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from contact.archive import archive_messages
+
+
+class Command(BaseCommand):
+    help = "Move old read contact messages into the monthly archive table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days', type=int,
+            default=getattr(settings, 'CONTACT_ARCHIVE_AFTER_DAYS', 180),
+            help="Only archive messages received more than this many days ago",
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--limit', type=int, help="Stop after this many messages")
+
+    def handle(self, *args, **options):
+        moved = archive_messages(
+            older_than_days=options['older_than_days'],
+            batch_size=options['batch_size'],
+            limit=options['limit'],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Archived {moved} message(s)"))
@@ -1,6 +1,7 @@
 from django.db import models
+from core.models import SingletonModel
 
-class ContactInfo(models.Model):
+class ContactInfo(SingletonModel):
     """Singleton model for global contact information"""
     address_line1 = models.CharField(max_length=255)
     address_line2 = models.CharField(max_length=255, blank=True)
@@ -18,16 +19,6 @@ class ContactInfo(models.Model):
     class Meta:
         verbose_name_plural = "Contact Info"
 
-    def save(self, *args, **kwargs):
-        # Ensure only one record exists
-        self.pk = 1
-        super().save(*args, **kwargs)
-
-    @classmethod
-    def load(cls):
-        obj, created = cls.objects.get_or_create(pk=1)
-        return obj
-
     def __str__(self):
         return "Contact Information"
 
@@ -41,6 +32,32 @@ class ContactMessage(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at'], name='contactmsg_created_idx'),
+            # Archival picks read messages by age
+            models.Index(fields=['is_read', 'created_at'], name='contactmsg_read_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} - {self.subject[:30]}"
+
+class ArchivedContactMessage(models.Model):
+    """Read messages moved out of ContactMessage by `manage.py archive_contact_messages`"""
+    original_id = models.BigIntegerField(unique=True)
+    name = models.CharField(max_length=200)
+    email = models.EmailField()
+    subject = models.CharField(max_length=300)
+    message = models.TextField()
+    created_at = models.DateTimeField()
+    is_read = models.BooleanField(default=True)
+    month = models.DateField(help_text="First day of the month the message was received")
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['month', 'created_at'], name='contactarchive_month_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.name} - {self.subject[:30]}"
\ No newline at end of file
+        return f"{self.name} - {self.subject[:30]}"
@@ -1,3 +1,296 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .archive import archive_messages
+from .ingest import MessageBuffer
+from .models import ArchivedContactMessage, ContactInfo, ContactMessage
+from .throttle import CacheBackend, ContactThrottle, MemoryBackend, get_client_ip
+
+
+class ContactInfoLoadTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_load_is_served_from_process_cache(self):
+        ContactInfo.load()
+        with self.assertNumQueries(0):
+            info = ContactInfo.load()
+        self.assertEqual(info.pk, 1)
+
+    def test_save_is_picked_up_by_load(self):
+        ContactInfo.load()
+        with self.captureOnCommitCallbacks(execute=True):
+            ContactInfo(sales_phone="+92 300 0000000").save()
+        self.assertEqual(ContactInfo.load().sales_phone, "+92 300 0000000")
+        self.assertEqual(ContactInfo.objects.count(), 1)
+
+
+class MessageBufferTests(TestCase):
+    def make_message(self, i=0):
+        return ContactMessage(name=f"N{i}", email="a@example.com", subject="Hi", message="Hello")
+
+    def test_flush_writes_in_batches(self):
+        buffer = MessageBuffer(batch_size=2)
+        for i in range(5):
+            self.assertTrue(buffer.submit(self.make_message(i)))
+        with self.assertNumQueries(3):
+            buffer.flush()
+        self.assertEqual(ContactMessage.objects.count(), 5)
+        self.assertEqual(buffer.stats['written'], 5)
+
+    def test_full_buffer_refuses(self):
+        buffer = MessageBuffer(max_size=1)
+        self.assertTrue(buffer.submit(self.make_message()))
+        self.assertFalse(buffer.submit(self.make_message()))
+        self.assertEqual(buffer.stats['rejected'], 1)
+
+    def test_failed_batch_goes_to_dead_letter(self):
+        path = Path(tempfile.mkdtemp()) / 'dead.jsonl'
+        self.addCleanup(shutil.rmtree, path.parent)
+        buffer = MessageBuffer(dead_letter=path)
+        buffer.submit(self.make_message())
+        with mock.patch.object(ContactMessage.objects, 'bulk_create', side_effect=DatabaseError), \
+                self.assertLogs('contact.ingest', 'ERROR'):
+            buffer.flush()
+        self.assertEqual(json.loads(path.read_text())['name'], "N0")
+        self.assertEqual(buffer.stats['failed'], 1)
+
+
+@override_settings(CONTACT_INGEST_MODE='buffered')
+class BufferedContactMessageViewTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch('contact.views.throttle', ContactThrottle(MemoryBackend(), {}, 0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, **data):
+        return self.client.post(
+            reverse('contact-message'), json.dumps(data), content_type='application/json'
+        )
+
+    def test_valid_message_is_accepted(self):
+        buffer = MessageBuffer()
+        with mock.patch('contact.views.get_buffer', return_value=buffer):
+            response = self.post(name="N", email="a@example.com", subject="S", message="M")
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(buffer.queue.qsize(), 1)
+
+    def test_non_string_fields_are_rejected(self):
+        self.assertEqual(self.post(name="N", email=5, subject="S", message="M").status_code, 400)
+        self.assertEqual(self.post(name="N", email="a@example.com", subject=["S"], message="M").status_code, 400)
+        response = self.client.post(reverse('contact-message'), '[]', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_email_is_rejected_before_queueing(self):
+        response = self.post(name="N", email="nope", subject="S", message="M")
+        self.assertEqual(response.status_code, 400)
+
+    def test_full_buffer_answers_503(self):
+        buffer = MessageBuffer(max_size=1)
+        buffer.submit(ContactMessage())
+        with mock.patch('contact.views.get_buffer', return_value=buffer):
+            response = self.post(name="N", email="a@example.com", subject="S", message="M")
+        self.assertEqual(response.status_code, 503)
+
+
+class ContactThrottleTests(TestCase):
+    def setUp(self):
+        self.throttle = ContactThrottle(
+            MemoryBackend(max_keys=100), {'ip': (2, 60), 'email': (1, 60)}, dedupe_window=60
+        )
+        patcher = mock.patch('contact.views.throttle', self.throttle)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, email="a@example.com", message="Hello"):
+        return self.client.post(
+            reverse('contact-message'),
+            json.dumps({'name': "N", 'email': email, 'subject': "S", 'message': message}),
+            content_type='application/json',
+        )
+
+    def test_ip_bucket_rejects_burst_without_queries(self):
+        self.post(email="a@example.com")
+        self.post(email="b@example.com")
+        with self.assertNumQueries(0):
+            response = self.post(email="c@example.com")
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(self.throttle.stats['ip_limited'], 1)
+
+    def test_email_bucket_is_case_insensitive(self):
+        self.assertEqual(self.post(email="a@example.com").status_code, 200)
+        self.assertEqual(self.post(email="A@Example.com", message="Other").status_code, 429)
+        self.assertEqual(self.throttle.stats['email_limited'], 1)
+
+    def test_identical_resubmit_is_dropped(self):
+        self.throttle.limits = {}
+        self.post()
+        with self.assertNumQueries(0):
+            response = self.post()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ContactMessage.objects.count(), 1)
+        self.assertEqual(self.throttle.stats['duplicates'], 1)
+
+    def test_failed_save_is_not_remembered(self):
+        self.throttle.limits = {}
+        with mock.patch.object(ContactMessage, 'save', side_effect=DatabaseError("down")):
+            self.assertEqual(self.post().status_code, 500)
+        self.assertEqual(self.post().status_code, 200)
+        self.assertEqual(ContactMessage.objects.count(), 1)
+        self.assertEqual(self.throttle.stats['duplicates'], 0)
+
+    @override_settings(CONTACT_INGEST_MODE='buffered')
+    def test_refused_submit_is_not_remembered(self):
+        self.throttle.limits = {}
+        buffer = MessageBuffer(max_size=1)
+        buffer.submit(ContactMessage())
+        with mock.patch('contact.views.get_buffer', return_value=buffer):
+            self.assertEqual(self.post().status_code, 503)
+            buffer.queue.get_nowait()
+            self.assertEqual(self.post().status_code, 202)
+        self.assertEqual(buffer.queue.qsize(), 1)
+
+    @override_settings(TRUSTED_PROXIES=['10.0.0.0/8'])
+    def test_clients_behind_a_trusted_proxy_get_their_own_bucket(self):
+        for i in range(3):
+            response = self.client.post(
+                reverse('contact-message'),
+                json.dumps({'name': "N", 'email': f"{i}@example.com", 'subject': "S", 'message': "M"}),
+                content_type='application/json',
+                REMOTE_ADDR='10.0.0.2', HTTP_X_FORWARDED_FOR=f'203.0.113.{i}',
+            )
+            self.assertEqual(response.status_code, 200)
+
+    def test_client_ip(self):
+        def ip(remote, forwarded=None):
+            headers = {'HTTP_X_FORWARDED_FOR': forwarded} if forwarded else {}
+            return get_client_ip(RequestFactory().get('/', REMOTE_ADDR=remote, **headers))
+
+        self.assertEqual(ip('10.0.0.2', '203.0.113.7'), '10.0.0.2')
+        with self.settings(TRUSTED_PROXIES=['10.0.0.0/8', '192.0.2.1']):
+            self.assertEqual(ip('10.0.0.2', '203.0.113.7'), '203.0.113.7')
+            # A spoofed left-most entry is ignored
+            self.assertEqual(ip('10.0.0.2', '1.1.1.1, 203.0.113.7, 192.0.2.1'), '203.0.113.7')
+            self.assertEqual(ip('198.51.100.5', '203.0.113.7'), '198.51.100.5')
+            self.assertEqual(ip('10.0.0.2'), '10.0.0.2')
+
+    def test_stats_are_served_to_staff(self):
+        self.throttle.limits = {}
+        self.post()
+        self.post()
+        url = reverse('contact-throttle')
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_login(User.objects.create_user('staff', is_staff=True))
+        self.assertEqual(self.client.get(url).json(), {
+            'scope': 'this worker', 'rejected': {'ip_limited': 0, 'email_limited': 0, 'duplicates': 1},
+        })
+
+    def test_cache_backend_counts_for_all_workers(self):
+        cache.clear()
+        workers = [ContactThrottle(CacheBackend(), {'ip': (1, 60)}, 0) for _ in range(2)]
+        for throttle in workers:
+            throttle.allow_ip('203.0.113.7')
+        self.assertEqual(workers[0].get_stats()['rejected']['ip_limited'], 1)
+        self.assertEqual(workers[1].get_stats()['scope'], 'all workers')
+
+    def test_memory_backend_evicts_least_recently_used(self):
+        backend = MemoryBackend(max_keys=2)
+        backend.set('a', 1, 60)
+        backend.set('b', 2, 60)
+        backend.get('a')
+        backend.set('c', 3, 60)
+        self.assertEqual((backend.get('a'), backend.get('b'), backend.get('c')), (1, None, 3))
+
+
+class ContactMessageExportTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        self.client.force_login(self.admin)
+        ContactMessage.objects.create(name="Read", email="a@example.com", subject="S", message="M", is_read=True)
+        ContactMessage.objects.create(name="Unread", email="b@example.com", subject="S", message="Line\nbreak")
+        self.url = reverse('admin:contact_contactmessage_export')
+
+    def test_csv_export_streams_rows(self):
+        response = self.client.get(self.url)
+        self.assertTrue(response.streaming)
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows[0][:3], ['id', 'name', 'email'])
+        self.assertEqual([r[1] for r in rows[1:]], ["Read", "Unread"])
+        self.assertEqual(rows[2][4], "Line\nbreak")
+
+    def test_csv_neutralises_formulas(self):
+        ContactMessage.objects.create(
+            name="=HYPERLINK(\"http://x\")", email="c@example.com", subject="@SUM(A1)", message="-2+3",
+        )
+        rows = list(csv.reader(io.StringIO(b''.join(self.client.get(self.url).streaming_content).decode())))
+        self.assertEqual(rows[-1][1:5], ["'=HYPERLINK(\"http://x\")", "c@example.com", "'@SUM(A1)", "'-2+3"])
+        ndjson = b''.join(self.client.get(self.url, {'format': 'ndjson'}).streaming_content).decode()
+        self.assertEqual(json.loads(ndjson.splitlines()[-1])['message'], "-2+3")
+
+    def test_export_reads_keyset_batches(self):
+        for i in range(3):
+            ContactMessage.objects.create(name=f"More {i}", email="c@example.com", subject="S", message="M")
+        response = self.client.get(self.url, {'format': 'ndjson'})
+        with mock.patch('contact.export.CHUNK_SIZE', 2), self.assertNumQueries(3):
+            lines = b''.join(response.streaming_content).decode().splitlines()
+        ids = [json.loads(line)['id'] for line in lines]
+        self.assertEqual(ids, sorted(ContactMessage.objects.values_list('id', flat=True)))
+
+    def test_ndjson_export_with_filter(self):
+        response = self.client.get(self.url, {'format': 'ndjson', 'is_read': '0'})
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)['name'] for line in lines], ["Unread"])
+
+    def test_date_filter(self):
+        response = self.client.get(self.url, {'format': 'ndjson', 'until': '2000-01-01'})
+        self.assertEqual(b''.join(response.streaming_content), b'')
+
+    def test_requires_staff(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+
+
+class ArchiveTests(TestCase):
+    def make_message(self, days_ago, is_read=True):
+        message = ContactMessage.objects.create(
+            name="N", email="a@example.com", subject="S", message="M", is_read=is_read
+        )
+        ContactMessage.objects.filter(pk=message.pk).update(
+            created_at=timezone.now() - timedelta(days=days_ago)
+        )
+        return message
+
+    def test_moves_only_old_read_messages(self):
+        old = self.make_message(400)
+        self.make_message(400, is_read=False)
+        self.make_message(10)
+        self.assertEqual(archive_messages(older_than_days=180, batch_size=1), 1)
+        self.assertEqual(ContactMessage.objects.count(), 2)
+        archived = ArchivedContactMessage.objects.get()
+        self.assertEqual(archived.original_id, old.id)
+        self.assertEqual(archived.month.day, 1)
+
+    def test_batches_until_done(self):
+        for _ in range(5):
+            self.make_message(400)
+        self.assertEqual(archive_messages(older_than_days=180, batch_size=2), 5)
+        self.assertFalse(ContactMessage.objects.exists())
+        self.assertEqual(ArchivedContactMessage.objects.count(), 5)
+
+    def test_limit(self):
+        for _ in range(3):
+            self.make_message(400)
+        self.assertEqual(archive_messages(older_than_days=180, batch_size=2, limit=1), 1)
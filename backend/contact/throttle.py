@@ -0,0 +1,199 @@
+"""
+Pre-database protection for the contact form.
+
+Token buckets per client IP and per email address, plus a short window in
+which an identical name/email/subject/message is dropped as a duplicate.
+State lives in a fixed-size LRU in process memory, or in the Django cache
+(``CONTACT_THROTTLE_BACKEND = 'cache'``) when several workers must share it.
+Rejections are counted per reason in ``throttle.stats`` and, with the cache
+backend, in shared counters; ``throttle.get_stats()`` (served to staff at
+/api/contact-throttle/) reports the latter when available.
+"""
+import hashlib
+import logging
+import ipaddress
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+REASONS = ('ip_limited', 'email_limited', 'duplicates')
+
+
+class MemoryBackend:
+    """Bounded LRU of key -> value with per-key expiry."""
+    shared = False
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            item = self.data.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if expires <= time.monotonic():
+                del self.data[key]
+                return None
+            self.data.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout):
+        with self.lock:
+            self.data[key] = (value, time.monotonic() + timeout)
+            self.data.move_to_end(key)
+            while len(self.data) > self.max_keys:
+                self.data.popitem(last=False)
+
+    def add(self, key, value, timeout):
+        if self.get(key) is not None:
+            return False
+        self.set(key, value, timeout)
+        return True
+
+    def delete(self, key):
+        with self.lock:
+            self.data.pop(key, None)
+
+
+class CacheBackend:
+    """Shared state through the Django cache (e.g. Redis or Memcached)."""
+    prefix = 'contact-throttle:'
+    shared = True
+
+    def get(self, key):
+        return cache.get(self.prefix + key)
+
+    def set(self, key, value, timeout):
+        cache.set(self.prefix + key, value, timeout)
+
+    def add(self, key, value, timeout):
+        return cache.add(self.prefix + key, value, timeout)
+
+    def delete(self, key):
+        cache.delete(self.prefix + key)
+
+    def incr(self, key):
+        cache.add(self.prefix + key, 0, None)
+        cache.incr(self.prefix + key)
+
+    def get_many(self, keys):
+        found = cache.get_many([self.prefix + key for key in keys])
+        return {key: found[self.prefix + key] for key in keys if self.prefix + key in found}
+
+
+class ContactThrottle:
+    def __init__(self, backend, limits, dedupe_window):
+        # limits: {'ip': (burst, seconds), 'email': (burst, seconds)}
+        self.backend = backend
+        self.limits = limits
+        self.dedupe_window = dedupe_window
+        self.stats = Counter()
+
+    def take_token(self, scope, ident):
+        """Token bucket: ``burst`` requests, refilled evenly over ``seconds``."""
+        burst, seconds = self.limits[scope]
+        key = f'{scope}:{ident}'
+        now = time.time()
+        tokens, last = self.backend.get(key) or (burst, now)
+        tokens = min(burst, tokens + (now - last) * burst / seconds)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self.backend.set(key, (tokens, now), seconds)
+        if not allowed:
+            self.count(f'{scope}_limited')
+        return allowed
+
+    def count(self, reason):
+        self.stats[reason] += 1
+        if self.backend.shared:
+            try:
+                self.backend.incr('stats:' + reason)
+            except Exception:
+                logger.warning("Could not count a %s rejection", reason, exc_info=True)
+
+    def get_stats(self):
+        """Rejections per reason, of all workers when the backend is shared."""
+        if self.backend.shared:
+            found = self.backend.get_many(['stats:' + reason for reason in REASONS])
+            counts = {reason: found.get('stats:' + reason, 0) for reason in REASONS}
+        else:
+            counts = {reason: self.stats[reason] for reason in REASONS}
+        return {'scope': 'all workers' if self.backend.shared else 'this worker', 'rejected': counts}
+
+    def allow_ip(self, ip):
+        return 'ip' not in self.limits or self.take_token('ip', ip)
+
+    def allow_email(self, email):
+        return 'email' not in self.limits or self.take_token('email', email.strip().lower())
+
+    def dedupe_key(self, name, email, subject, message):
+        raw = '\x1f'.join(
+            ' '.join(str(v).split()).lower() for v in (name, email, subject, message)
+        )
+        return 'dup:' + hashlib.sha256(raw.encode()).hexdigest()
+
+    def is_duplicate(self, name, email, subject, message):
+        """
+        True if the same message was seen within the dedupe window. Otherwise
+        the message is claimed; call forget() if it then isn't stored.
+        """
+        if not self.dedupe_window:
+            return False
+        if self.backend.add(self.dedupe_key(name, email, subject, message), 1, self.dedupe_window):
+            return False
+        self.count('duplicates')
+        return True
+
+    def forget(self, name, email, subject, message):
+        """Release a claim from is_duplicate() so a retry is accepted."""
+        if self.dedupe_window:
+            self.backend.delete(self.dedupe_key(name, email, subject, message))
+
+
+def is_trusted_proxy(address, networks):
+    try:
+        ip = ipaddress.ip_address(address.strip())
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+def get_client_ip(request):
+    """
+    The visitor's address. Behind proxies listed in TRUSTED_PROXIES (IPs or
+    CIDR networks) it is the right-most X-Forwarded-For entry that is not
+    itself one of them; without the setting, REMOTE_ADDR.
+    """
+    remote = request.META.get('REMOTE_ADDR', '')
+    networks = [ipaddress.ip_network(p, strict=False) for p in getattr(settings, 'TRUSTED_PROXIES', ())]
+    if not networks or not is_trusted_proxy(remote, networks):
+        return remote
+    forwarded = [a.strip() for a in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if a.strip()]
+    for address in reversed(forwarded):
+        if not is_trusted_proxy(address, networks):
+            return address
+    return forwarded[0] if forwarded else remote
+
+
+def make_throttle():
+    if getattr(settings, 'CONTACT_THROTTLE_BACKEND', 'memory') == 'cache':
+        backend = CacheBackend()
+    else:
+        backend = MemoryBackend(getattr(settings, 'CONTACT_THROTTLE_MAX_KEYS', 10000))
+    return ContactThrottle(
+        backend,
+        limits=getattr(settings, 'CONTACT_THROTTLE_LIMITS', {'ip': (5, 60), 'email': (3, 300)}),
+        dedupe_window=getattr(settings, 'CONTACT_DEDUPE_WINDOW', 600),
+    )
+
+
+throttle = make_throttle()
@@ -1,7 +1,9 @@
 from django.urls import path
+from core.views import api_view
 from . import views
 
 urlpatterns = [
-    path('api/contact-info/', views.ContactInfoView.as_view(), name='contact-info'),
+    path('api/contact-info/', api_view(views.ContactInfoView, views.ContactInfoAsyncView), name='contact-info'),
     path('api/contact-message/', views.ContactMessageView.as_view(), name='contact-message'),
-]
\ No newline at end of file
+    path('api/contact-throttle/', views.ContactThrottleStatsView.as_view(), name='contact-throttle'),
+]
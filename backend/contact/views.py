@@ -1,14 +1,28 @@
 import json
-from django.http import JsonResponse
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import HttpResponse
+from core.cache import acached_json, cached_json
+from core.http import JsonResponse
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
+from core.views import ConditionalGetMixin
+from .ingest import get_buffer
 from .models import ContactInfo, ContactMessage
+from .throttle import get_client_ip, throttle
+
+class ContactInfoView(ConditionalGetMixin, View):
+    depends_on = (ContactInfo,)
+    payload_name = 'contact-info'
 
-class ContactInfoView(View):
     def get(self, request):
-        info = ContactInfo.load()
-        data = {
+        body = cached_json(self.payload_name, self.depends_on, lambda: self.serialize(ContactInfo.load()))
+        return HttpResponse(body, content_type='application/json')
+
+    def serialize(self, info):
+        return {
             'address_line1': info.address_line1,
             'address_line2': info.address_line2,
             'city_state_zip': info.city_state_zip,
@@ -21,13 +35,32 @@ class ContactInfoView(View):
             'hours_sunday': info.hours_sunday,
             'map_embed_url': info.map_embed_url,
         }
-        return JsonResponse(data)
+
+class ContactInfoAsyncView(ContactInfoView):
+    async def get(self, request):
+        body = await acached_json(self.payload_name, self.depends_on, self.abuild)
+        return HttpResponse(body, content_type='application/json')
+
+    async def abuild(self):
+        # Served from the per-process singleton cache, normally no query
+        info = await sync_to_async(ContactInfo.load)()
+        return self.serialize(info)
 
 @method_decorator(csrf_exempt, name='dispatch')
 class ContactMessageView(View):
+    def too_many(self):
+        response = JsonResponse({'error': 'Too many messages, please retry later'}, status=429)
+        response['Retry-After'] = '60'
+        return response
+
     def post(self, request):
+        # Rate limits and duplicate suppression run before the ORM is touched
+        if not throttle.allow_ip(get_client_ip(request)):
+            return self.too_many()
         try:
             data = json.loads(request.body)
+            if not isinstance(data, dict):
+                return JsonResponse({'error': 'Expected a JSON object'}, status=400)
             name = data.get('name')
             email = data.get('email')
             subject = data.get('subject')
@@ -35,13 +68,50 @@ class ContactMessageView(View):
 
             if not all([name, email, subject, message]):
                 return JsonResponse({'error': 'All fields are required'}, status=400)
+            if not all(isinstance(v, str) for v in (name, email, subject, message)):
+                return JsonResponse({'error': 'All fields must be strings'}, status=400)
+
+            if not throttle.allow_email(email):
+                return self.too_many()
 
-            ContactMessage.objects.create(
+            msg = ContactMessage(
                 name=name,
                 email=email,
                 subject=subject,
                 message=message
             )
+            try:
+                msg.full_clean()
+            except ValidationError as e:
+                return JsonResponse({'error': e.message_dict}, status=400)
+
+            if throttle.is_duplicate(name, email, subject, message):
+                # Same answer as the first submission, nothing is stored twice
+                return JsonResponse({'success': True, 'message': 'Message sent successfully'})
+
+            if getattr(settings, 'CONTACT_INGEST_MODE', 'sync') == 'buffered':
+                if not get_buffer().submit(msg):
+                    # Not stored: the retry must not be taken for a duplicate
+                    throttle.forget(name, email, subject, message)
+                    response = JsonResponse({'error': 'Too many messages, please retry shortly'}, status=503)
+                    response['Retry-After'] = '5'
+                    return response
+                return JsonResponse({'success': True, 'message': 'Message received'}, status=202)
+
+            try:
+                msg.save()
+            except Exception:
+                throttle.forget(name, email, subject, message)
+                raise
             return JsonResponse({'success': True, 'message': 'Message sent successfully'})
         except Exception as e:
-            return JsonResponse({'error': str(e)}, status=500)
\ No newline at end of file
+            return JsonResponse({'error': str(e)}, status=500)
+
+
+class ContactThrottleStatsView(View):
+    """Contact form rejections per reason (see contact/throttle.py), for staff."""
+
+    def get(self, request):
+        if not request.user.is_staff:
+            return JsonResponse({'error': 'Forbidden'}, status=403)
+        return JsonResponse(throttle.get_stats())
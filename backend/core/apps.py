@@ -0,0 +1,27 @@
+from django.apps import AppConfig
+from django.conf import settings
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
+
+    def ready(self):
+        from . import checks  # noqa: F401
+        from . import images, purge, routers, snapshots, timing, versions, warmup
+        from .models import ImageDerivative
+        versions.track(ImageDerivative)
+        connection_created.connect(timing.install, dispatch_uid='timing.install')
+        versions.content_changed.connect(routers.pin_primary, dispatch_uid='routers.pin_primary')
+        versions.content_changed.connect(purge.purge_on_change, dispatch_uid='purge.on_change')
+        if getattr(settings, 'IMAGE_DERIVATIVES_ENABLED', True):
+            images.track_image_fields()
+        if getattr(settings, 'API_SNAPSHOTS_ENABLED', False):
+            versions.content_changed.connect(
+                snapshots.publish_on_change, dispatch_uid='snapshots.publish'
+            )
+        if getattr(settings, 'API_WARMUP_ON_START', False):
+            request_started.connect(warmup.resume_after_fork, dispatch_uid='warmup.resume')
+            warmup.preload.start()
@@ -0,0 +1,273 @@
+"""
+Connection pooling for Django database backends.
+
+Django opens a connection per thread and, with ``CONN_MAX_AGE = 0``, closes
+it at the end of every request. The pooled backends (``core.backends.mysql``
+and ``core.backends.sqlite3``) hand the raw DB-API connection back to a
+bounded per-process pool instead, and the next request in any thread of the
+worker checks it out again.
+
+Configured with a ``POOL`` entry next to ``ENGINE`` in ``DATABASES``:
+
+    'POOL': {
+        'MAX_SIZE': 10,            # open connections per worker process
+        'TIMEOUT': 5,              # seconds to wait for a free connection
+        'MAX_LIFETIME': 3600,      # recycle connections older than this
+        'HEALTH_CHECK_AFTER': 30,  # ping connections idle longer than this
+    }
+
+Counters for every pool are available from ``get_stats()``.
+
+Pools are per process: in a forked child (e.g. gunicorn ``--preload``
+workers) every pool forgets the connections it inherited, without closing
+them, since their sockets still belong to the parent's sessions.
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from django.db.utils import OperationalError
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'MAX_SIZE': 10,
+    'TIMEOUT': 5,
+    'MAX_LIFETIME': 3600,
+    'HEALTH_CHECK_AFTER': 30,
+}
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PoolTimeout(OperationalError):
+    """No connection became free within the pool's TIMEOUT."""
+
+
+class ConnectionPool:
+    def __init__(self, max_size=10, timeout=5, max_lifetime=3600, health_check_after=30):
+        self.target = None
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.health_check_after = health_check_after
+        self.inherited = set()
+        self.reset()
+
+    def reset(self):
+        self.pid = os.getpid()
+        # (raw connection, created at, returned at), most recently used last
+        self.idle = deque()
+        self.born = {}
+        self.size = 0
+        self.cond = threading.Condition()
+        self.stats = {
+            'created': 0, 'closed': 0, 'checkouts': 0, 'waits': 0,
+            'wait_time': 0.0, 'max_wait': 0.0, 'timeouts': 0,
+            'health_check_failures': 0,
+        }
+
+    def reset_after_fork(self):
+        """
+        Start empty in a forked child. Checked-out connections inherited
+        from the parent are remembered so their release doesn't close them;
+        idle ones are kept referenced so their ids are never reused.
+        """
+        idle = {id(raw) for raw, created, returned in self.idle}
+        self.inherited = {key for key in self.born if key not in idle}
+        self.inherited_idle = [raw for raw, created, returned in self.idle]
+        self.reset()
+
+    def check_pid(self):
+        # Covers forks that bypassed os.register_at_fork (e.g. os.fork in C)
+        if self.pid != os.getpid():
+            self.reset_after_fork()
+
+    def acquire(self, connect, ping):
+        """
+        An idle connection that passes ``ping`` if one is due, else a new one
+        from ``connect()`` while the pool has room, else wait for a release.
+        """
+        self.check_pid()
+        start = time.monotonic()
+        waited = False
+        while True:
+            raw = None
+            with self.cond:
+                while not self.idle and self.size >= self.max_size:
+                    remaining = self.timeout - (time.monotonic() - start)
+                    if remaining <= 0:
+                        self.stats['timeouts'] += 1
+                        raise PoolTimeout(
+                            f"No database connection free after {self.timeout}s "
+                            f"({self.max_size} in use)"
+                        )
+                    waited = True
+                    self.cond.wait(remaining)
+                if self.idle:
+                    raw, created, returned = self.idle.pop()
+                else:
+                    # Reserve the slot, connect outside the lock
+                    self.size += 1
+            if raw is None:
+                break
+            now = time.monotonic()
+            if now - created > self.max_lifetime:
+                self.discard(raw)
+            elif now - returned > self.health_check_after and not ping(raw):
+                with self.cond:
+                    self.stats['health_check_failures'] += 1
+                self.discard(raw)
+            else:
+                return self._checkout(raw, start, waited)
+        try:
+            raw = connect()
+        except Exception:
+            with self.cond:
+                self.size -= 1
+                self.cond.notify()
+            raise
+        with self.cond:
+            self.stats['created'] += 1
+            self.born[id(raw)] = time.monotonic()
+        return self._checkout(raw, start, waited)
+
+    def _checkout(self, raw, start, waited):
+        with self.cond:
+            self.stats['checkouts'] += 1
+            if waited:
+                wait = time.monotonic() - start
+                self.stats['waits'] += 1
+                self.stats['wait_time'] += wait
+                self.stats['max_wait'] = max(self.stats['max_wait'], wait)
+        return raw
+
+    def release(self, raw, reusable=True):
+        self.check_pid()
+        with self.cond:
+            created = self.born.get(id(raw))
+            if reusable and created is not None and time.monotonic() - created <= self.max_lifetime:
+                self.idle.append((raw, created, time.monotonic()))
+                self.cond.notify()
+                return
+        self.discard(raw)
+
+    def discard(self, raw):
+        with self.cond:
+            if id(raw) in self.inherited:
+                # The parent process's session: just let go of it
+                self.inherited.discard(id(raw))
+                return
+            # Connections from a replaced pool were never counted here
+            if self.born.pop(id(raw), None) is not None:
+                self.size -= 1
+                self.stats['closed'] += 1
+            self.cond.notify()
+        try:
+            raw.close()
+        except Exception:
+            logger.debug("Error closing pooled connection", exc_info=True)
+
+    def clear(self):
+        """Close every idle connection (checked out ones close on release)."""
+        with self.cond:
+            idle, self.idle = self.idle, deque()
+        for raw, created, returned in idle:
+            self.discard(raw)
+
+    def get_stats(self):
+        with self.cond:
+            return {
+                'max_size': self.max_size,
+                'size': self.size,
+                'idle': len(self.idle),
+                'in_use': self.size - len(self.idle),
+                **self.stats,
+            }
+
+
+def get_pool(alias, settings_dict):
+    """
+    The pool for ``alias``. A pool only holds connections to one database,
+    so it is replaced when the alias is pointed elsewhere (as the test
+    runner does when it switches to the test database).
+    """
+    target = tuple(settings_dict.get(key) for key in ('HOST', 'PORT', 'NAME', 'USER'))
+    with _pools_lock:
+        pool = _pools.get(alias)
+        if pool is None or pool.target != target:
+            if pool is not None:
+                pool.clear()
+            options = {**DEFAULTS, **settings_dict.get('POOL', {})}
+            pool = ConnectionPool(**{key.lower(): value for key, value in options.items()})
+            pool.target = target
+            _pools[alias] = pool
+        return pool
+
+
+def _reset_after_fork():
+    global _pools_lock
+    # Runs in the child right after fork, before any other thread exists
+    _pools_lock = threading.Lock()
+    for pool in _pools.values():
+        pool.reset_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_stats():
+    """``{alias: counters}`` for every pool in this process."""
+    with _pools_lock:
+        pools = dict(_pools)
+    return {alias: pool.get_stats() for alias, pool in pools.items()}
+
+
+class PooledDatabaseWrapperMixin:
+    """
+    Mixed into a backend's DatabaseWrapper: connecting checks a connection
+    out of the pool and closing returns it, rolled back, for the next user.
+    """
+
+    @property
+    def pool(self):
+        return get_pool(self.alias, self.settings_dict)
+
+    def get_new_connection(self, conn_params):
+        parent = super()
+        return self.pool.acquire(lambda: parent.get_new_connection(conn_params), self.ping)
+
+    def ping(self, raw):
+        try:
+            cursor = raw.cursor()
+            try:
+                cursor.execute('SELECT 1')
+            finally:
+                cursor.close()
+        except Exception:
+            return False
+        return True
+
+    def _close(self):
+        if self.connection is None:
+            return
+        raw = self.connection
+        pool = self.pool
+        pool.check_pid()
+        if id(raw) in pool.inherited:
+            # Opened before a fork: a rollback would hit the parent's session
+            pool.discard(raw)
+            return
+        # Half-finished atomic blocks or a failed query leave the
+        # connection in a state the next user must not inherit.
+        reusable = not self.in_atomic_block and not self.errors_occurred
+        if reusable and not self.autocommit:
+            try:
+                raw.rollback()
+            except Exception:
+                reusable = False
+        pool.release(raw, reusable)
@@ -0,0 +1,104 @@
+"""
+Run several internal API GETs for one /api/batch/ request.
+
+Every path is resolved through the URLconf and its view is called with a
+plain GET request on a shared worker pool, so the sub-requests run
+concurrently. Whatever has not finished when the batch's time budget runs
+out is reported as a 504; its worker is left to finish in the background.
+"""
+import contextvars
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import close_old_connections
+from django.test import RequestFactory
+from django.urls import Resolver404, resolve
+
+from . import routers
+from .http import dumps
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'API_BATCH_WORKERS', 8),
+                thread_name_prefix='api-batch',
+            )
+        return _executor
+
+
+def result(path, status, body):
+    """One entry of the ``results`` list; ``body`` is JSON bytes."""
+    return b'{"path":' + dumps(path) + b',"status":' + str(status).encode() + b',"body":' + body + b'}'
+
+
+def error(path, status, message):
+    return result(path, status, dumps({'error': message}))
+
+
+def fetch(path, pinned_until=None):
+    """Run the view behind ``path`` and return its result entry."""
+    try:
+        match = resolve(urlsplit(path).path)
+    except Resolver404:
+        return error(path, 404, 'Not found')
+    if match.url_name == 'batch':
+        return error(path, 400, 'Batches cannot be nested')
+    request = RequestFactory().get(path)
+    # Sub-requests are anonymous: no session or auth runs for them
+    request.user = AnonymousUser()
+    # Routed like the same GET sent on its own
+    replica = routers.choose_replica(request, pinned_until)
+    view = match.func
+    if iscoroutinefunction(view):
+        view = async_to_sync(view)
+    try:
+        with routers.read_from(replica):
+            response = view(request, *match.args, **match.kwargs)
+    except Exception:
+        logger.exception("Batched request for %s failed", path)
+        return error(path, 500, 'Internal error')
+    finally:
+        # Each worker thread holds its own connection
+        close_old_connections()
+    if response.streaming:
+        content = b''.join(response.streaming_content)
+    else:
+        content = response.content
+    if not response.get('Content-Type', '').startswith('application/json'):
+        content = dumps(content.decode(response.charset, 'replace'))
+    return result(path, response.status_code, content)
+
+
+def run(paths, timeout=None):
+    """Result entries for ``paths``, in order, within ``timeout`` seconds."""
+    if timeout is None:
+        timeout = getattr(settings, 'API_BATCH_TIMEOUT', 5.0)
+    pinned_until = routers.get_pinned_until()
+    executor = get_executor()
+    futures = []
+    for path in paths:
+        # Carry the caller's context (e.g. its Server-Timing timer) into the worker
+        context = contextvars.copy_context()
+        futures.append(executor.submit(context.run, fetch, path, pinned_until))
+    done, pending = wait(futures, timeout=timeout)
+    results = []
+    for path, future in zip(paths, futures):
+        if future in done:
+            results.append(future.result())
+        else:
+            future.cancel()
+            results.append(error(path, 504, 'Timed out'))
+    return results
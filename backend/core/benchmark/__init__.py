@@ -0,0 +1,9 @@
+"""
+Load benchmark for the public API.
+
+``seed`` fills the database with reproducible synthetic content at a given
+scale and ``runner`` drives every read-only ``/api/*`` endpoint, in process
+through the full middleware stack or over HTTP against a running server.
+Both are used by ``manage.py benchmark``, which writes its results as JSON
+so runs can be compared across commits.
+"""
@@ -0,0 +1,152 @@
+"""
+Drive the read-only API endpoints and summarize latency.
+
+In-process runs go through Django's full handler and middleware with the
+test client, one client per worker thread. HTTP runs hit a running server.
+Query counts come from the Server-Timing header (see core.timing), so over
+HTTP they are only reported when the server sends it.
+"""
+import platform
+import re
+import resource
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.test import Client
+from django.test.utils import override_settings
+
+from modules.models import Module
+
+# Contact messages are left out: the throttle would answer most of them 429
+ENDPOINTS = [
+    '/api/home/',
+    '/api/hardware/',
+    '/api/modules/',
+    '/api/modules/?fields=id,name,slug,content',
+    '/api/categories/',
+    '/api/clients/',
+    '/api/clients/?limit=50',
+    '/api/contact-info/',
+    '/api/search/?q=payroll',
+    '/api/site/',
+]
+
+QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+
+
+def get_endpoints():
+    slug = Module.objects.filter(is_active=True).values_list('slug', flat=True).first()
+    if slug is None:
+        return ENDPOINTS
+    return ENDPOINTS + [f'/api/modules/{slug}/']
+
+
+def percentile(ordered, pct):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def peak_rss_kb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def summarize(path, mode, samples, elapsed):
+    """``samples`` is a list of (seconds, status, queries or None)."""
+    timings = sorted(seconds * 1000 for seconds, status, queries in samples)
+    queries = [queries for seconds, status, queries in samples if queries is not None]
+    return {
+        'path': path,
+        'mode': mode,
+        'requests': len(samples),
+        'errors': sum(1 for seconds, status, queries in samples if status >= 400),
+        'throughput': len(samples) / elapsed if elapsed else None,
+        'p50_ms': percentile(timings, 50),
+        'p95_ms': percentile(timings, 95),
+        'p99_ms': percentile(timings, 99),
+        'max_ms': timings[-1],
+        'queries': sum(queries) / len(queries) if queries else None,
+        'peak_rss_kb': peak_rss_kb(),
+    }
+
+
+def count_queries(header):
+    match = QUERIES_RE.search(header or '')
+    return int(match.group(1)) if match else None
+
+
+def drive(one, path, requests, concurrency, warmup):
+    for _ in range(warmup):
+        one(path)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(one, [path] * requests))
+    return samples, time.perf_counter() - start
+
+
+def run_in_process(paths, requests=100, concurrency=10, warmup=5):
+    local = threading.local()
+
+    def one(path):
+        if not hasattr(local, 'client'):
+            local.client = Client()
+        start = time.perf_counter()
+        try:
+            response = local.client.get(path)
+        finally:
+            # The test client keeps connections open, a server would not
+            close_old_connections()
+        return time.perf_counter() - start, response.status_code, count_queries(response.get('Server-Timing'))
+
+    results = []
+    with override_settings(
+        ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+        SERVER_TIMING_SAMPLE_RATE=1.0,
+        SERVER_TIMING_HEADER=True,
+    ):
+        for path in paths:
+            samples, elapsed = drive(one, path, requests, concurrency, warmup)
+            results.append(summarize(path, 'in-process', samples, elapsed))
+    return results
+
+
+def run_http(base_url, paths, requests=100, concurrency=10, warmup=5, timeout=30):
+    def one(path):
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(base_url.rstrip('/') + path, timeout=timeout) as response:
+                response.read()
+                status, header = response.status, response.headers.get('Server-Timing')
+        except urllib.error.HTTPError as e:
+            status, header = e.code, e.headers.get('Server-Timing')
+        return time.perf_counter() - start, status, count_queries(header)
+
+    results = []
+    for path in paths:
+        samples, elapsed = drive(one, path, requests, concurrency, warmup)
+        results.append(summarize(path, 'http', samples, elapsed))
+    return results
+
+
+def get_environment():
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'platform': platform.platform(),
+    }
@@ -0,0 +1,191 @@
+"""
+Synthetic content for benchmarks.
+
+Everything is generated from a seeded random.Random, so the same scale and
+seed always produce the same rows. ``seed()`` replaces whatever is in the
+database it runs on; ``manage.py benchmark --seed`` therefore only runs it
+inside ``scratch_database()``, never on the configured one.
+"""
+import random
+from contextlib import contextmanager
+
+from django.db import connection, transaction
+from django.test.utils import override_settings
+
+from clients.models import Category, Client
+from contact.models import ContactInfo
+from hardware.models import Device, DistributorInfo, Feature, OfficeAddress
+from home.models import (
+    AppFeature, Award, Certification, HeroSection, Stat, Testimonial, WhyChooseFeature,
+)
+from modules.models import Module
+
+from .. import versions
+
+# Stamps and payloads of the scratch database must not reach the shared cache
+SCRATCH_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'benchmark-scratch',
+    },
+}
+
+# Named scales: {name: (clients, modules)}
+SCALES = {
+    'small': (10, 5),
+    '1k': (1000, 20),
+    '100k': (100000, 50),
+}
+
+WORDS = (
+    'payroll attendance leave shift employee biometric report policy tax '
+    'salary overtime roster device branch approval workflow portal mobile '
+    'cloud audit compliance benefits loan expense recruitment training'
+).split()
+
+BATCH_SIZE = 1000
+
+
+def get_models():
+    return [
+        Category, Client, Module, HeroSection, WhyChooseFeature, AppFeature, Stat,
+        Testimonial, Certification, Award, Feature, Device, DistributorInfo,
+        OfficeAddress, ContactInfo,
+    ]
+
+
+def words(rng, count):
+    return ' '.join(rng.choice(WORDS) for _ in range(count))
+
+
+def html(rng, size):
+    """About ``size`` bytes of paragraph markup."""
+    parts = []
+    length = 0
+    while length < size:
+        part = f'<p>{words(rng, 60)}</p>'
+        parts.append(part)
+        length += len(part)
+    return ''.join(parts)
+
+
+@contextmanager
+def scratch_database(verbosity=1, interactive=True):
+    """
+    Point the default connection at a new, migrated test database (named as
+    the test runner would) and destroy it on exit. Meanwhile the cache is
+    private to this process, reads stay off the replicas and content changes
+    neither purge the CDN nor publish snapshots.
+    """
+    old_name = connection.settings_dict['NAME']
+    publishing = versions.content_changed.disconnect(dispatch_uid='snapshots.publish')
+    try:
+        with override_settings(CACHES=SCRATCH_CACHES, DATABASE_REPLICAS={}, API_PURGE_URL=None):
+            connection.creation.create_test_db(
+                verbosity=verbosity, autoclobber=not interactive, serialize=False,
+            )
+            try:
+                yield connection.settings_dict['NAME']
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity)
+    finally:
+        if publishing:
+            from .. import snapshots
+            versions.content_changed.connect(
+                snapshots.publish_on_change, dispatch_uid='snapshots.publish'
+            )
+
+
+def seed(clients=1000, modules=20, module_size=50_000, random_seed=0):
+    """
+    Replace the content of every public model with synthetic rows and
+    return ``{model label: row count}``.
+    """
+    rng = random.Random(random_seed)
+    with transaction.atomic():
+        # Plain DELETEs: the ORM would load and signal every row (children first)
+        with connection.cursor() as cursor:
+            for model in reversed(get_models()):
+                cursor.execute(f'DELETE FROM {connection.ops.quote_name(model._meta.db_table)}')
+
+        categories = Category.objects.bulk_create(
+            Category(name=f'Category {i}', order=i) for i in range(10)
+        )
+        Client.objects.bulk_create(
+            (
+                Client(
+                    name=f'Client {i} {words(rng, 2)}'.title(),
+                    category=rng.choice(categories),
+                    order=i,
+                    is_active=rng.random() > 0.05,
+                )
+                for i in range(clients)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        Module.objects.bulk_create(
+            Module(
+                name=f'Module {i}',
+                slug=f'module-{i}',
+                hero_heading=words(rng, 6).title(),
+                hero_description=words(rng, 30),
+                content=html(rng, module_size),
+                icon_name='UserGroupIcon',
+                order=i,
+            )
+            for i in range(modules)
+        )
+
+        HeroSection.objects.create(heading=words(rng, 6).title(), description=words(rng, 30))
+        WhyChooseFeature.objects.bulk_create(
+            WhyChooseFeature(title=words(rng, 3).title(), order=i) for i in range(6)
+        )
+        AppFeature.objects.bulk_create(
+            AppFeature(description=words(rng, 8), order=i) for i in range(8)
+        )
+        Stat.objects.bulk_create(
+            Stat(value=f'{rng.randint(100, 5000):,}+', label=words(rng, 3).upper(), order=i)
+            for i in range(4)
+        )
+        Testimonial.objects.bulk_create(
+            Testimonial(
+                quote=words(rng, 40), author_name=words(rng, 2).title(),
+                author_title=words(rng, 3).title(), order=i,
+            )
+            for i in range(10)
+        )
+        Certification.objects.bulk_create(
+            Certification(name=f'Certification {i}', image=f'certifications/bench-{i}.png', order=i)
+            for i in range(6)
+        )
+        Award.objects.bulk_create(
+            Award(name=f'Award {i}', image=f'awards/bench-{i}.png', order=i)
+            for i in range(6)
+        )
+
+        Feature.objects.bulk_create(
+            Feature(title=words(rng, 3).title(), description=words(rng, 20), order=i)
+            for i in range(6)
+        )
+        Device.objects.bulk_create(
+            Device(
+                name=f'Device {i}', tagline=words(rng, 5),
+                specs=[words(rng, 4) for _ in range(6)], order=i,
+            )
+            for i in range(12)
+        )
+        DistributorInfo.objects.create(description=words(rng, 30))
+        OfficeAddress.objects.bulk_create(
+            OfficeAddress(location_name=words(rng, 2).title(), address_line1=words(rng, 4), order=i)
+            for i in range(4)
+        )
+        ContactInfo.objects.create(
+            address_line1=words(rng, 4), city_state_zip=words(rng, 3),
+            sales_phone='+92 300 0000000', support_phone='+92 300 0000001',
+            info_email='info@example.com', support_email='support@example.com',
+        )
+
+    # bulk_create sends no post_save, move the stamps by hand
+    for model in get_models():
+        versions.bump(model)
+    return {model._meta.label: model.objects.count() for model in get_models()}
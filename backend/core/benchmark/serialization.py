@@ -0,0 +1,106 @@
+"""
+Micro-benchmark of the JSON layer in core.http.
+
+Each case builds the body of one large endpoint from the current database
+two ways: the way the views used to (model instances, a dict per row, one
+storage.url() call per image, django.http.JsonResponse) and through the
+views' current code (``.values()`` rows, attach_media(), core.http).
+"""
+import json
+import time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse as DjangoJsonResponse
+
+from clients.models import Client
+from clients.views import ClientListView
+from modules.models import Module
+from modules.views import ModuleListView
+
+from .. import http
+from ..images import get_srcsets
+
+
+def legacy_clients():
+    clients = list(Client.objects.filter(is_active=True).order_by('order', 'name', 'id'))
+    srcsets = get_srcsets([c.logo for c in clients])
+    data = []
+    for client in clients:
+        data.append({
+            'id': client.id,
+            'name': client.name,
+            'logo': client.logo.url if client.logo else None,
+            'logo_srcset': srcsets.get(client.logo.name),
+            'category_id': client.category_id,
+        })
+    return DjangoJsonResponse(data, safe=False).content
+
+
+def fast_clients():
+    view = ClientListView()
+    rows = list(Client.objects.filter(is_active=True).order_by('order', 'name', 'id')
+                .values('id', 'name', 'logo', 'category_id', 'order'))
+    return view.render(*view.paginate(rows, None)).content
+
+
+def legacy_modules():
+    data = []
+    modules = list(Module.objects.filter(is_active=True).order_by('order', 'name'))
+    srcsets = get_srcsets([m.featured_image for m in modules])
+    for module in modules:
+        data.append({
+            'id': module.id,
+            'name': module.name,
+            'slug': module.slug,
+            'content': module.content,
+            'featured_image': module.featured_image.url if module.featured_image else None,
+            'featured_image_srcset': srcsets.get(module.featured_image.name),
+        })
+    return DjangoJsonResponse(data, safe=False).content
+
+
+def fast_modules():
+    view = ModuleListView()
+    keys = ['id', 'name', 'slug', 'content', 'featured_image', 'featured_image_srcset']
+    return http.JsonResponse(view.serialize(list(view.get_queryset(keys)), keys), safe=False).content
+
+
+def encode_stdlib(payload):
+    return json.dumps(payload, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+
+
+CASES = [
+    ('/api/clients/', legacy_clients, fast_clients),
+    ('/api/modules/?fields=...,content', legacy_modules, fast_modules),
+]
+
+
+def best_of(func, repeat, number):
+    """Fastest mean seconds per call over ``repeat`` rounds of ``number`` calls."""
+    func()
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = (time.perf_counter() - start) / number
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(repeat=5, number=20):
+    results = []
+    for name, legacy, fast in CASES:
+        payload = json.loads(fast())
+        for label, before, after in [
+            (name, legacy, fast),
+            (f'{name} (encoding only)', lambda: encode_stdlib(payload), lambda: http.dumps(payload)),
+        ]:
+            before_s, after_s = best_of(before, repeat, number), best_of(after, repeat, number)
+            results.append({
+                'case': label,
+                'legacy_ms': before_s * 1000,
+                'fast_ms': after_s * 1000,
+                'speedup': before_s / after_s if after_s else None,
+            })
+    return results
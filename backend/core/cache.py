@@ -0,0 +1,77 @@
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from . import versions
+from .http import dumps
+
+KEY_PREFIX = 'payload:'
+
+logger = logging.getLogger(__name__)
+
+
+def cached_json(name, depends_on, build):
+    """
+    Return the serialized JSON body for ``name``.
+
+    ``build`` is only called when the body is missing from the cache or one
+    of the ``depends_on`` models changed since it was stored.
+    """
+    return cached_bodies({name: (depends_on, lambda: dumps(build()))})[name]
+
+
+def cached_bodies(entries):
+    """
+    cached_json() for several ``{name: (depends_on, build)}`` entries at
+    once, with a single cache lookup. Here ``build`` returns the body bytes.
+    """
+    keys = {name: KEY_PREFIX + name for name in entries}
+    version_keys = {versions.get_key(m) for depends_on, build in entries.values() for m in depends_on}
+    try:
+        found = cache.get_many([*keys.values(), *version_keys])
+    except Exception:
+        # Cache down: build everything (get_versions() degrades the same way)
+        logger.warning("Payload cache unavailable", exc_info=True)
+        found = {}
+
+    bodies = {}
+    missed = {}
+    for name, (depends_on, build) in entries.items():
+        stamp = versions.get_versions(depends_on, found)
+        entry = found.get(keys[name])
+        if entry is not None and entry[0] == stamp:
+            bodies[name] = entry[1]
+        else:
+            bodies[name] = build()
+            missed[keys[name]] = (stamp, bodies[name])
+    if missed:
+        try:
+            cache.set_many(missed, getattr(settings, 'API_CACHE_TIMEOUT', None))
+        except Exception:
+            logger.warning("Payload cache unavailable", exc_info=True)
+    return bodies
+
+
+async def acached_json(name, depends_on, abuild):
+    """Async cached_json(): ``abuild`` is awaited on a miss."""
+    key = KEY_PREFIX + name
+    version_keys = [versions.get_key(m) for m in depends_on]
+    try:
+        found = await cache.aget_many([key] + version_keys)
+    except Exception:
+        logger.warning("Payload cache unavailable", exc_info=True)
+        found = {}
+    stamp = await sync_to_async(versions.get_versions)(depends_on, found)
+
+    entry = found.get(key)
+    if entry is not None and entry[0] == stamp:
+        return entry[1]
+
+    body = dumps(await abuild())
+    try:
+        await cache.aset(key, (stamp, body), getattr(settings, 'API_CACHE_TIMEOUT', None))
+    except Exception:
+        logger.warning("Payload cache unavailable", exc_info=True)
+    return body
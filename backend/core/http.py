@@ -0,0 +1,79 @@
+"""
+Shared JSON responses for the API.
+
+Views pull plain rows with ``.values()``, resolve their media fields in
+bulk with ``attach_media()`` and return a ``JsonResponse``. Bodies are
+encoded with orjson when it is installed and with the stdlib json module
+otherwise; both produce the same compact UTF-8 bytes, with values handled
+like DjangoJSONEncoder does.
+"""
+import json
+
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+from . import timing
+from .images import get_srcsets
+
+try:
+    import orjson
+except ImportError:  # optional, the stdlib encoder is used without it
+    orjson = None
+
+_encoder = DjangoJSONEncoder()
+
+
+def _default(obj):
+    return _encoder.default(obj)
+
+
+def dumps(data):
+    """Compact JSON bytes for ``data``."""
+    with timing.measure('serialize'):
+        if orjson is not None:
+            # Dates go through DjangoJSONEncoder so both encoders agree
+            return orjson.dumps(data, default=_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        # Like orjson, non-ASCII text goes out as UTF-8 rather than \u escapes
+        return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+class JsonResponse(HttpResponse):
+    """
+    Like django.http.JsonResponse, encoded with dumps(). ``safe`` (the
+    default) only allows dicts at the top level.
+    """
+
+    def __init__(self, data, safe=True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError("In order to allow non-dict objects to be serialized set the safe parameter to False.")
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=dumps(data), **kwargs)
+
+
+def media_urls(names):
+    """``{name: url}`` for the storage names, each resolved once."""
+    return {name: default_storage.url(name) for name in set(names) if name}
+
+
+def attach_media(rows, *fields, srcsets=True):
+    """
+    Turn the storage names in ``fields`` of ``rows`` (dicts from
+    ``.values()``) into URLs, with a ``<field>_srcset`` key after each when
+    ``srcsets`` is true. URLs and srcsets are looked up once for all rows.
+    """
+    names = [row[field] for row in rows for field in fields if row[field]]
+    urls = media_urls(names)
+    srcset_map = get_srcsets(names) if srcsets and names else {}
+    result = []
+    for row in rows:
+        item = {}
+        for key, value in row.items():
+            if key in fields:
+                item[key] = urls.get(value)
+                if srcsets:
+                    item[f'{key}_srcset'] = srcset_map.get(value)
+            else:
+                item[key] = value
+        result.append(item)
+    return result
@@ -0,0 +1,153 @@
+"""
+Responsive image derivatives.
+
+Every ImageField upload is resized to the fixed ``WIDTHS`` and re-encoded as
+AVIF (when Pillow can write it), WebP and JPEG in a background thread. Files
+are stored under ``derivatives/<sha256>/`` so identical content is only
+processed once, whatever it was uploaded as, and a re-save of an unchanged
+image is a no-op. Views expose the result next to the original URL as a
+``srcset`` string per format.
+"""
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, models, transaction
+from django.db.models.signals import post_save
+from PIL import Image, ImageOps
+
+from .models import ImageDerivative
+
+WIDTHS = (64, 128, 256, 512, 1024)
+# Preferred first; formats this Pillow build can't write are skipped
+FORMATS = (('avif', 'AVIF'), ('webp', 'WEBP'), ('jpeg', 'JPEG'))
+QUALITY = {'AVIF': 60, 'WEBP': 80, 'JPEG': 82}
+DERIVATIVE_DIR = 'derivatives'
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='image-derivatives')
+
+
+def get_formats():
+    Image.init()
+    return [(ext, fmt) for ext, fmt in FORMATS if fmt in Image.SAVE]
+
+
+def get_widths(original):
+    """Configured widths below ``original``, never upscaling."""
+    configured = getattr(settings, 'IMAGE_DERIVATIVE_WIDTHS', WIDTHS)
+    widths = [w for w in configured if w < original]
+    if original <= max(configured):
+        widths.append(original)
+    return widths
+
+
+def encode(image, fmt):
+    if fmt == 'JPEG' and image.mode != 'RGB':
+        background = Image.new('RGB', image.size, 'white')
+        rgba = image.convert('RGBA')
+        background.paste(rgba, mask=rgba.getchannel('A'))
+        image = background
+    elif image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA')
+    out = BytesIO()
+    image.save(out, fmt, quality=QUALITY[fmt])
+    return out.getvalue()
+
+
+def generate(name, force=False):
+    """
+    Create the derivatives for the stored image ``name``.
+
+    Skips images that already have derivatives unless ``force`` is set, in
+    which case the content hash still avoids redoing unchanged work.
+    """
+    if not force and ImageDerivative.objects.filter(source=name).exists():
+        return None
+
+    with default_storage.open(name, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+
+    derivative = ImageDerivative.objects.filter(source=name).first()
+    if derivative is not None and derivative.content_hash == digest:
+        return derivative
+
+    image = ImageOps.exif_transpose(Image.open(BytesIO(data)))
+    variants = {}
+    for width in get_widths(image.width):
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.LANCZOS) if width != image.width else image
+        for ext, fmt in get_formats():
+            path = f'{DERIVATIVE_DIR}/{digest[:2]}/{digest}/{width}.{ext}'
+            if not default_storage.exists(path):
+                default_storage.save(path, ContentFile(encode(resized, fmt)))
+            variants.setdefault(ext, []).append([path, width])
+
+    derivative, created = ImageDerivative.objects.update_or_create(
+        source=name, defaults={'content_hash': digest, 'variants': variants},
+    )
+    return derivative
+
+
+def generate_safe(name):
+    # Runs on the executor thread, which holds its own DB connection
+    close_old_connections()
+    try:
+        generate(name)
+    except Exception:
+        logger.exception("Generating image derivatives for %s failed", name)
+    finally:
+        close_old_connections()
+
+
+def schedule(name):
+    transaction.on_commit(lambda: _executor.submit(generate_safe, name))
+
+
+def _on_save(sender, instance, **kwargs):
+    for field in sender._meta.fields:
+        if isinstance(field, models.ImageField):
+            file = getattr(instance, field.attname)
+            if file:
+                schedule(file.name)
+
+
+def get_image_models():
+    return [
+        model for model in apps.get_models()
+        if any(isinstance(f, models.ImageField) for f in model._meta.fields)
+    ]
+
+
+def track_image_fields():
+    """Generate derivatives whenever a model with an ImageField is saved."""
+    for model in get_image_models():
+        post_save.connect(
+            _on_save, sender=model, dispatch_uid='images:' + model._meta.label
+        )
+
+
+def get_srcsets(files):
+    """
+    Return ``{name: {format: srcset}}`` for the given field files (or
+    storage names) in one query, e.g.
+    ``{'clients/logos/a.png': {'webp': '/media/.../64.webp 64w, ...'}}``.
+    """
+    names = {getattr(f, 'name', f) for f in files if f}
+    if not names:
+        return {}
+    rows = ImageDerivative.objects.filter(source__in=names).values_list('source', 'variants')
+    return {
+        source: {
+            ext: ', '.join(f'{default_storage.url(path)} {width}w' for path, width in items)
+            for ext, items in variants.items()
+        }
+        for source, variants in rows
+    }
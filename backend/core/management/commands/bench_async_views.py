@@ -0,0 +1,81 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.test import AsyncRequestFactory, RequestFactory
+
+from clients import views as client_views
+from contact import views as contact_views
+from hardware import views as hardware_views
+from home import views as home_views
+from modules import views as module_views
+
+# (path, sync view, async view)
+VIEWS = [
+    ('/api/home/', home_views.HomePageView, home_views.HomePageAsyncView),
+    ('/api/hardware/', hardware_views.HardwareView, hardware_views.HardwareAsyncView),
+    ('/api/modules/', module_views.ModuleListView, module_views.ModuleListAsyncView),
+    ('/api/categories/', client_views.CategoryListView, client_views.CategoryListAsyncView),
+    ('/api/clients/', client_views.ClientListView, client_views.ClientListAsyncView),
+    ('/api/contact-info/', contact_views.ContactInfoView, contact_views.ContactInfoAsyncView),
+]
+
+
+def percentile(timings, pct):
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class Command(BaseCommand):
+    help = "Compare p50/p99 latency of the sync (WSGI) and async (ASGI) API views"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help="Requests per view and mode")
+        parser.add_argument('--concurrency', type=int, default=20, help="Requests in flight at once")
+
+    def handle(self, *args, **options):
+        total, concurrency = options['requests'], options['concurrency']
+        self.stdout.write(
+            f"{'path':<22} {'mode':<6} {'p50 ms':>8} {'p99 ms':>8} {'mean ms':>8}"
+        )
+        for path, sync_class, async_class in VIEWS:
+            for mode, timings in (
+                ('wsgi', self.run_sync(sync_class.as_view(), path, total, concurrency)),
+                ('asgi', asyncio.run(self.run_async(async_class.as_view(), path, total, concurrency))),
+            ):
+                ms = [t * 1000 for t in timings]
+                self.stdout.write(
+                    f"{path:<22} {mode:<6} {percentile(ms, 50):>8.2f} "
+                    f"{percentile(ms, 99):>8.2f} {statistics.mean(ms):>8.2f}"
+                )
+
+    def run_sync(self, view, path, total, concurrency):
+        """A thread per in-flight request, like a threaded WSGI server."""
+        factory = RequestFactory()
+
+        def one(_):
+            start = time.perf_counter()
+            try:
+                view(factory.get(path))
+            finally:
+                close_old_connections()
+            return time.perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return list(pool.map(one, range(total)))
+
+    async def run_async(self, view, path, total, concurrency):
+        """All requests on one event loop, like an ASGI server."""
+        factory = AsyncRequestFactory()
+        slots = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with slots:
+                start = time.perf_counter()
+                await view(factory.get(path))
+                return time.perf_counter() - start
+
+        return await asyncio.gather(*(one() for _ in range(total)))
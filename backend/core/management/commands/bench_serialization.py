@@ -0,0 +1,30 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from core import http
+from core.benchmark import serialization
+
+
+class Command(BaseCommand):
+    help = "Compare the old and the current JSON serialization of the largest endpoints"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help="Rounds, the fastest one counts")
+        parser.add_argument('--number', type=int, default=20, help="Calls per round")
+        parser.add_argument('--output', help="Write the results as JSON to this file")
+
+    def handle(self, *args, **options):
+        results = serialization.run(repeat=options['repeat'], number=options['number'])
+        encoder = 'orjson' if http.orjson is not None else 'json (orjson not installed)'
+        self.stdout.write(f"Encoder: {encoder}")
+        self.stdout.write(f"{'case':<48} {'legacy ms':>10} {'fast ms':>10} {'speedup':>8}")
+        for result in results:
+            self.stdout.write(
+                f"{result['case']:<48} {result['legacy_ms']:>10.3f} "
+                f"{result['fast_ms']:>10.3f} {result['speedup']:>7.1f}x"
+            )
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump({'encoder': encoder, 'results': results}, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
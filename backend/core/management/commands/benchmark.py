@@ -0,0 +1,93 @@
+import json
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import runner, seed
+
+
+class Command(BaseCommand):
+    help = "Benchmark the public API endpoints, optionally on freshly seeded data"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed', action='store_true',
+            help="Benchmark synthetic rows in a scratch test database instead of the configured one",
+        )
+        parser.add_argument('--scale', choices=seed.SCALES, default='1k', help="Size of the seeded data")
+        parser.add_argument('--clients', type=int, help="Override the number of seeded clients")
+        parser.add_argument('--modules', type=int, help="Override the number of seeded modules")
+        parser.add_argument('--module-size', type=int, default=50_000, help="Bytes of content per module")
+        parser.add_argument('--random-seed', type=int, default=0)
+        parser.add_argument(
+            '--noinput', '--no-input', action='store_false', dest='interactive',
+            help="Replace a leftover scratch database without asking",
+        )
+        parser.add_argument('--requests', type=int, default=100, help="Requests per endpoint")
+        parser.add_argument('--concurrency', type=int, default=10, help="Requests in flight at once")
+        parser.add_argument('--warmup', type=int, default=5, help="Untimed requests per endpoint")
+        parser.add_argument('--url', help="Also benchmark a running server at this base URL")
+        parser.add_argument('--path', action='append', dest='paths', help="Only this endpoint (repeatable)")
+        parser.add_argument('--output', help="Write the results as JSON to this file")
+
+    def handle(self, *args, **options):
+        if not options['seed']:
+            return self.benchmark(options, None)
+        if options['url']:
+            raise CommandError("--url benchmarks the server's own database, it can't be combined with --seed.")
+        with seed.scratch_database(options['verbosity'], options['interactive']):
+            return self.benchmark(options, self.seed(options))
+
+    def benchmark(self, options, scale):
+        paths = options['paths'] or runner.get_endpoints()
+        settings = {key: options[key] for key in ('requests', 'concurrency', 'warmup')}
+
+        results = runner.run_in_process(paths, **settings)
+        if options['url']:
+            results += runner.run_http(options['url'], paths, **settings)
+        self.print_results(results)
+
+        if options['output']:
+            report = {
+                'created_at': datetime.now(timezone.utc).isoformat(),
+                'environment': runner.get_environment(),
+                'scale': scale,
+                'settings': settings,
+                'results': results,
+            }
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+
+    def seed(self, options):
+        clients, modules = seed.SCALES[options['scale']]
+        if options['clients'] is not None:
+            clients = options['clients']
+        if options['modules'] is not None:
+            modules = options['modules']
+        rows = seed.seed(
+            clients=clients, modules=modules, module_size=options['module_size'],
+            random_seed=options['random_seed'],
+        )
+        self.stdout.write(f"Seeded {clients} clients and {modules} modules")
+        return {
+            'name': options['scale'],
+            'module_size': options['module_size'],
+            'random_seed': options['random_seed'],
+            'rows': rows,
+        }
+
+    def print_results(self, results):
+        self.stdout.write(
+            f"{'path':<44} {'mode':<10} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+            f"{'p99 ms':>8} {'queries':>7} {'rss MB':>7}"
+        )
+        for result in results:
+            queries = '-' if result['queries'] is None else f"{result['queries']:.1f}"
+            self.stdout.write(
+                f"{result['path']:<44} {result['mode']:<10} {result['throughput']:>8.1f} "
+                f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+                f"{queries:>7} {result['peak_rss_kb'] / 1024:>7.1f}"
+            )
+            if result['errors']:
+                self.stderr.write(f"  {result['errors']} error response(s) from {result['path']}")
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db import models
+
+from core import images
+
+
+class Command(BaseCommand):
+    help = "Create resized WebP/AVIF/JPEG variants for every uploaded image"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true',
+            help="Re-hash images that already have derivatives",
+        )
+
+    def handle(self, *args, **options):
+        count = 0
+        for model in images.get_image_models():
+            fields = [f.attname for f in model._meta.fields if isinstance(f, models.ImageField)]
+            for row in model.objects.values_list(*fields).iterator():
+                for name in filter(None, row):
+                    try:
+                        if images.generate(name, force=options['force']) is not None:
+                            count += 1
+                    except Exception as e:
+                        self.stderr.write(f"  {name}: {e}")
+        self.stdout.write(self.style.SUCCESS(f"Processed {count} image(s)"))
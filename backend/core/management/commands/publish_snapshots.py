@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from core import snapshots
+
+
+class Command(BaseCommand):
+    help = "Write static JSON (+ .gz/.br) snapshots of the public API endpoints"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true',
+            help="Rewrite every snapshot, even if its models did not change",
+        )
+
+    def handle(self, *args, **options):
+        written = snapshots.publish(force=options['force'])
+        for path in written:
+            self.stdout.write(f"  {path}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Published {len(written)} snapshot(s) to {snapshots.get_root()}"
+        ))
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import warmup
+
+
+class Command(BaseCommand):
+    help = "Build every cacheable API payload into the shared cache, with per-item timings"
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        results = warmup.warm()
+        elapsed = time.perf_counter() - start
+        for result in results:
+            line = f"  {result['name']:<44} {result['ms']:>9.1f} ms"
+            if result['error']:
+                self.stderr.write(f"{line}  FAILED: {result['error']}")
+            else:
+                self.stdout.write(line)
+        failed = [r['name'] for r in results if r['error']]
+        if failed:
+            raise CommandError(f"{len(failed)} of {len(results)} item(s) failed: {', '.join(failed)}")
+        self.stdout.write(self.style.SUCCESS(f"Warmed {len(results)} item(s) in {elapsed:.2f}s"))
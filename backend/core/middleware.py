@@ -0,0 +1,93 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from . import purge, routers, timing
+
+
+class ReplicaMiddleware:
+    """Route the reads of safe, non-admin requests to a read replica."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not routers.get_replicas():
+            return self.get_response(request)
+        alias = routers.choose_replica(request, routers.get_pinned_until())
+        with routers.read_from(alias):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        if not routers.get_replicas():
+            return await self.get_response(request)
+        alias = routers.choose_replica(request, await routers.aget_pinned_until())
+        with routers.read_from(alias):
+            return await self.get_response(request)
+
+
+class ServerTimingMiddleware:
+    """
+    Time a sample of requests (see core.timing). Listed last in MIDDLEWARE,
+    so the ``view`` duration is the view alone.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timer = timing.start_request()
+        if timer is None:
+            return self.get_response(request)
+        start = time.perf_counter()
+        with timing.track(timer):
+            response = self.get_response(request)
+        return timing.finish_request(request, response, timer, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        timer = timing.start_request()
+        if timer is None:
+            return await self.get_response(request)
+        start = time.perf_counter()
+        with timing.track(timer):
+            response = await self.get_response(request)
+        return timing.finish_request(request, response, timer, time.perf_counter() - start)
+
+
+class ApiCacheControlMiddleware:
+    """
+    /api/ responses that did not declare themselves cacheable (see
+    core.purge.set_cache_headers) must not be kept by the proxy.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        if request.path.startswith('/api/') and not response.has_header('Cache-Control'):
+            purge.set_uncacheable(response)
+        return response
@@ -0,0 +1,49 @@
+from django.db import models
+
+from . import versions
+
+# Per-process cache of singleton rows: {model: (stamp, instance)}
+_instances = {}
+
+
+class SingletonModel(models.Model):
+    """
+    Abstract base for models that only ever have one row (pk=1).
+
+    ``load()`` keeps the row in a per-process cache and only goes back to the
+    database when the model's change stamp moves, so an admin save in one
+    worker reaches all of them through the shared cache (see CACHES and the
+    core.W001 check). The subclass must be registered with
+    ``versions.track()``. Treat the returned instance as read-only.
+    """
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        # Ensure only one record exists
+        self.pk = 1
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def load(cls):
+        stamp = versions.get_versions([cls])
+        cached = _instances.get(cls)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        obj, created = cls.objects.get_or_create(pk=1)
+        _instances[cls] = (stamp, obj)
+        return obj
+
+
+class ImageDerivative(models.Model):
+    """Resized variants generated for one uploaded image (see core/images.py)."""
+    source = models.CharField(max_length=255, unique=True)
+    content_hash = models.CharField(max_length=64, db_index=True)
+    # {format: [[storage path, width], ...]} ordered by width
+    variants = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.source
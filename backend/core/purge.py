@@ -0,0 +1,128 @@
+"""
+Surrogate keys for a caching proxy in front of the API, and tag purges.
+
+Cacheable API responses list the models they were built from, e.g.
+``Surrogate-Key: home.Stat clients.Client`` (Fastly, Varnish xkey) and
+``Cache-Tag: home.Stat,clients.Client`` (Cloudflare), with a
+``Cache-Control`` that lets the proxy keep them. Only with API_PURGE_URL
+set can the proxy keep them until they change (API_CACHE_CONTROL); without
+purges, and for responses that differ per request (/api/home/ draws a new
+client strip each time), it keeps them briefly
+(API_SHORT_CACHE_CONTROL).
+
+When a model's change stamp moves, its label is queued and, after
+API_PURGE_DELAY seconds (so one admin save is one purge), sent to
+API_PURGE_URL: the tags go in the API_PURGE_TAG_HEADER header and as a
+``{"tags": [...]}`` JSON body. Nothing is sent while API_PURGE_URL is unset.
+"""
+import json
+import logging
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+
+from django.conf import settings
+from django.utils.cache import patch_cache_control
+
+from . import versions
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_CONTROL = 'public, max-age=0, s-maxage=86400'
+DEFAULT_SHORT_CACHE_CONTROL = 'public, max-age=0, s-maxage=60'
+
+
+def get_cache_control(varies=False):
+    if varies or not getattr(settings, 'API_PURGE_URL', None):
+        return getattr(settings, 'API_SHORT_CACHE_CONTROL', DEFAULT_SHORT_CACHE_CONTROL)
+    return getattr(settings, 'API_CACHE_CONTROL', DEFAULT_CACHE_CONTROL)
+
+
+def set_cache_headers(response, models, varies=False):
+    """
+    Mark ``response`` as cacheable by the proxy until ``models`` change, or
+    only briefly if its body ``varies`` between requests.
+    """
+    labels = [versions.get_label(m) for m in models]
+    if labels:
+        response.headers['Surrogate-Key'] = ' '.join(labels)
+        response.headers['Cache-Tag'] = ','.join(labels)
+    if not response.has_header('Cache-Control'):
+        response.headers['Cache-Control'] = get_cache_control(varies)
+    return response
+
+
+def set_uncacheable(response):
+    patch_cache_control(response, private=True, no_store=True)
+    return response
+
+
+class PurgeDispatcher:
+    """Collects changed labels and sends them to the proxy in one request."""
+
+    attempts = 3
+
+    def __init__(self):
+        self.pending = set()
+        self.lock = threading.Lock()
+        self.timer = None
+        self.stats = Counter()
+
+    def queue(self, label):
+        if not getattr(settings, 'API_PURGE_URL', None):
+            return
+        delay = getattr(settings, 'API_PURGE_DELAY', 0.5)
+        with self.lock:
+            self.pending.add(label)
+            if self.timer is None:
+                self.timer = threading.Timer(delay, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self):
+        """Send the queued labels now; returns them."""
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            labels, self.pending = sorted(self.pending), set()
+        if labels:
+            self.send(labels)
+        return labels
+
+    def send(self, labels):
+        request = urllib.request.Request(
+            settings.API_PURGE_URL,
+            data=json.dumps({'tags': labels}).encode(),
+            method=getattr(settings, 'API_PURGE_METHOD', 'POST'),
+            headers={
+                'Content-Type': 'application/json',
+                getattr(settings, 'API_PURGE_TAG_HEADER', 'Surrogate-Key'): ' '.join(labels),
+                **getattr(settings, 'API_PURGE_HEADERS', {}),
+            },
+        )
+        timeout = getattr(settings, 'API_PURGE_TIMEOUT', 5)
+        for attempt in range(1, self.attempts + 1):
+            try:
+                with urllib.request.urlopen(request, timeout=timeout) as response:
+                    response.read()
+            except (urllib.error.URLError, OSError) as e:
+                if attempt == self.attempts:
+                    self.stats['failed'] += 1
+                    logger.error("Purging %s failed: %s", ', '.join(labels), e)
+                    return False
+                time.sleep(0.2 * 2 ** attempt)
+            else:
+                self.stats['sent'] += 1
+                self.stats['tags'] += len(labels)
+                return True
+
+
+dispatcher = PurgeDispatcher()
+
+
+def purge_on_change(label, **kwargs):
+    """content_changed receiver."""
+    dispatcher.queue(label)
@@ -0,0 +1,67 @@
+"""
+EXPLAIN checks for the queries a view runs.
+
+``find_plan_problems()`` runs EXPLAIN on every SELECT captured from a view
+and reports full table scans and sorts that can't use an index (a MySQL
+"Using filesort" or an SQLite "USE TEMP B-TREE FOR ORDER BY"), ignoring
+tables with fewer than ``threshold`` rows where a scan is the right plan.
+"""
+import re
+
+SQLITE_SCAN_RE = re.compile(r'^SCAN (?:TABLE )?(\w+)$')
+# Django renders filter(is_active=True) as a bare `WHERE "t"."is_active"` on
+# SQLite, which SQLite can't match to an index, while MySQL gets `= 1`.
+# Plans are checked for the MySQL form, which is what production runs.
+SQLITE_BARE_FLAG_RE = re.compile(r'("\w+"\."(?:is_active|is_read)")(?!\s*(?:=|IN|IS))')
+
+
+def table_rows(connection, table):
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')
+        return cursor.fetchone()[0]
+
+
+def explain_sqlite(connection, sql, threshold):
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN ' + SQLITE_BARE_FLAG_RE.sub(r'\1 = 1', sql))
+        details = [row[-1] for row in cursor.fetchall()]
+    problems = []
+    for detail in details:
+        match = SQLITE_SCAN_RE.match(detail)
+        if match and table_rows(connection, match.group(1)) >= threshold:
+            problems.append(f'full scan of {match.group(1)}')
+        if 'TEMP B-TREE' in detail:
+            problems.append(detail.lower())
+    return problems
+
+
+def explain_mysql(connection, sql, threshold):
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN ' + sql)
+        columns = [c[0] for c in cursor.description]
+        plans = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    problems = []
+    for plan in plans:
+        rows = plan.get('rows') or 0
+        if plan.get('type') == 'ALL' and rows >= threshold:
+            problems.append(f"full scan of {plan['table']} (~{rows} rows)")
+        if 'Using filesort' in (plan.get('Extra') or '') and rows >= threshold:
+            problems.append(f"filesort on {plan['table']} (~{rows} rows)")
+    return problems
+
+
+def find_plan_problems(connection, queries, threshold=100):
+    """
+    Return ``[(sql, [problem, ...]), ...]`` for the captured ``queries``
+    (``CaptureQueriesContext.captured_queries``) whose plan is not index-backed.
+    """
+    explain = {'sqlite': explain_sqlite, 'mysql': explain_mysql}[connection.vendor]
+    found = []
+    for query in queries:
+        sql = query['sql']
+        if not sql.lstrip().upper().startswith('SELECT'):
+            continue
+        problems = explain(connection, sql, threshold)
+        if problems:
+            found.append((sql, problems))
+    return found
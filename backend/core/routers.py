@@ -0,0 +1,113 @@
+"""
+Read replicas for the public API.
+
+``DATABASE_REPLICAS`` maps database aliases (each also in ``DATABASES``) to
+weights. ReplicaMiddleware picks one replica per safe, non-admin request
+and ReplicaRouter sends that request's reads there; writes, the admin,
+management commands and background threads stay on the primary.
+
+Replicas lag behind the primary, so for ``DATABASE_REPLICA_LAG`` seconds
+after any tracked content change every worker reads from the primary. That
+way editors see their saves right away, and no payload is cached under a
+new change stamp from a replica that has not caught up yet.
+"""
+import logging
+import math
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.urls import reverse
+
+PIN_KEY = 'replica:primary-until'
+
+logger = logging.getLogger(__name__)
+
+# The replica alias reads of the current request go to, None for the primary
+_read_alias = ContextVar('read_alias', default=None)
+
+
+def get_replicas():
+    return getattr(settings, 'DATABASE_REPLICAS', {})
+
+
+def pin_primary(**kwargs):
+    """content_changed receiver: keep reads on the primary while replicas catch up."""
+    lag = getattr(settings, 'DATABASE_REPLICA_LAG', 5)
+    if get_replicas() and lag:
+        try:
+            cache.set(PIN_KEY, time.time() + lag, lag)
+        except Exception:
+            logger.exception("Could not pin reads to the primary")
+
+
+def get_pinned_until():
+    """The PIN_KEY value; without the cache, reads stay on the primary."""
+    try:
+        return cache.get(PIN_KEY)
+    except Exception:
+        logger.warning("Replica pin unavailable, reading from the primary", exc_info=True)
+        return math.inf
+
+
+async def aget_pinned_until():
+    try:
+        return await cache.aget(PIN_KEY)
+    except Exception:
+        logger.warning("Replica pin unavailable, reading from the primary", exc_info=True)
+        return math.inf
+
+
+def is_primary_pinned(pinned_until):
+    return pinned_until is not None and pinned_until > time.time()
+
+
+def choose_replica(request, pinned_until=None):
+    """The replica alias for ``request``, or None when it must use the primary."""
+    replicas = get_replicas()
+    if (
+        not replicas
+        or request.method not in ('GET', 'HEAD', 'OPTIONS')
+        or request.path.startswith(reverse('admin:index'))
+        or is_primary_pinned(pinned_until)
+    ):
+        return None
+    aliases = [alias for alias, weight in replicas.items() if weight > 0]
+    if not aliases:
+        return None
+    return random.choices(aliases, [replicas[alias] for alias in aliases])[0]
+
+
+@contextmanager
+def read_from(alias):
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # A replica holds the same rows as the primary
+        databases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        # Replicas get their schema through replication; the primary may also
+        # take a share of the reads
+        if db != DEFAULT_DB_ALIAS and db in get_replicas():
+            return False
+        return None
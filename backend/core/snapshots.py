@@ -0,0 +1,208 @@
+"""
+Static JSON snapshots of the public API.
+
+Each endpoint is rendered through its own view and written under
+``API_SNAPSHOT_ROOT`` as ``<path>/index.json`` plus ``.gz``/``.br`` variants,
+so a front proxy can serve anonymous reads straight from disk, e.g. nginx
+``try_files /snapshots$uri/index.json`` with ``gzip_static``/``brotli_static``.
+
+A manifest remembers the change stamps and body hash of each snapshot; only
+snapshots whose source models moved are re-rendered, and only changed bodies
+are rewritten.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.test import RequestFactory
+from django.urls import resolve
+
+from . import versions
+
+try:
+    import brotli
+except ImportError:  # optional, .br variants are skipped without it
+    brotli = None
+
+# Endpoints published as snapshots (module detail pages are added per slug)
+SNAPSHOT_PATHS = [
+    '/api/home/',
+    '/api/hardware/',
+    '/api/modules/',
+    '/api/categories/',
+    '/api/clients/',
+    '/api/contact-info/',
+]
+
+MANIFEST_NAME = 'manifest.json'
+
+logger = logging.getLogger(__name__)
+
+
+def get_root():
+    return Path(getattr(settings, 'API_SNAPSHOT_ROOT', settings.BASE_DIR / 'snapshots'))
+
+
+def get_snapshot_paths():
+    from modules.models import Module
+
+    slugs = Module.objects.filter(is_active=True).values_list('slug', flat=True)
+    return SNAPSHOT_PATHS + [f'/api/modules/{slug}/' for slug in slugs]
+
+
+def get_depends_on(path):
+    return getattr(resolve(path).func.view_class, 'depends_on', ())
+
+
+def get_payload_name(path):
+    """The payload cache name the view behind ``path`` stores its body under."""
+    return resolve(path).func.view_class.payload_name
+
+
+def render(path):
+    """Run the view behind ``path`` in-process and return its JSON body."""
+    match = resolve(path)
+    request = RequestFactory().get(path)
+    view = match.func
+    if iscoroutinefunction(view):
+        view = async_to_sync(view)
+    response = view(request, *match.args, **match.kwargs)
+    if response.status_code != 200:
+        raise ValueError(f"{path} returned {response.status_code}")
+    return response.content
+
+
+def write_atomic(target, data):
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix='.' + target.name)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, target)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def write_snapshot(root, path, body):
+    target = root / path.strip('/') / 'index.json'
+    write_atomic(target, body)
+    write_atomic(target.with_name('index.json.gz'), gzip.compress(body, 9, mtime=0))
+    if brotli is not None:
+        write_atomic(target.with_name('index.json.br'), brotli.compress(body, quality=11))
+
+
+def remove_snapshot(root, path):
+    for name in ('index.json', 'index.json.gz', 'index.json.br'):
+        try:
+            (root / path.strip('/') / name).unlink()
+        except FileNotFoundError:
+            pass
+
+
+def load_manifest(root):
+    try:
+        return json.loads((root / MANIFEST_NAME).read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def publish(labels=None, force=False):
+    """
+    Rewrite the snapshots that are out of date.
+
+    ``labels`` limits the run to snapshots depending on those models.
+    Snapshots whose stamps are unchanged are skipped without rendering, and
+    a re-rendered body identical to the published one (e.g. after the
+    stamps were reset) is not rewritten. Returns the list of paths written.
+    """
+    root = get_root()
+    manifest = load_manifest(root)
+    paths = get_snapshot_paths()
+    written = []
+
+    for path in paths:
+        depends_on = get_depends_on(path)
+        stamps = versions.get_versions(depends_on)
+        if labels is not None and not set(labels) & set(stamps):
+            continue
+        entry = manifest.get(path) or {}
+        if not force and entry.get('stamps') == stamps:
+            continue
+        body = render(path)
+        digest = hashlib.sha256(body).hexdigest()
+        if force or entry.get('sha256') != digest:
+            write_snapshot(root, path, body)
+            written.append(path)
+        manifest[path] = {'stamps': stamps, 'sha256': digest}
+
+    for path in set(manifest) - set(paths):
+        remove_snapshot(root, path)
+        del manifest[path]
+
+    write_atomic(root / MANIFEST_NAME, json.dumps(manifest, indent=2).encode())
+    return written
+
+
+class Publisher:
+    """
+    Collects changed labels and publishes them together in a background
+    thread, API_SNAPSHOT_DELAY seconds after the first one, so one admin
+    save (or bulk delete) is one publish and never slows the request.
+    """
+
+    def __init__(self):
+        self.pending = set()
+        self.lock = threading.Lock()
+        self.publish_lock = threading.Lock()
+        self.timer = None
+
+    def queue(self, label):
+        delay = getattr(settings, 'API_SNAPSHOT_DELAY', 1.0)
+        with self.lock:
+            self.pending.add(label)
+            if self.timer is None:
+                self.timer = threading.Timer(delay, self.run)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self):
+        """Publish the queued labels now; returns the paths written."""
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            labels, self.pending = sorted(self.pending), set()
+        if not labels:
+            return []
+        # A failed publish must not be fatal; the next change or the command catches up
+        with self.publish_lock:
+            try:
+                return publish(labels=labels)
+            except Exception:
+                logger.exception("Publishing API snapshots for %s failed", ', '.join(labels))
+                return []
+
+    def run(self):
+        try:
+            self.flush()
+        finally:
+            # The timer thread's own connections
+            connections.close_all()
+
+
+publisher = Publisher()
+
+
+def publish_on_change(sender, label, **kwargs):
+    """content_changed receiver."""
+    publisher.queue(label)
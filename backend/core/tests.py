@@ -0,0 +1,1082 @@
+import gzip
+import json
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from functools import partial
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.cache.backends.base import BaseCache
+from django.core.files.base import ContentFile
+from django.core.management import CommandError, call_command
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connections
+from django.test import (
+    AsyncRequestFactory, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+
+from clients import views as client_views
+from clients.models import Category, Client
+from contact import views as contact_views
+from contact.models import ContactInfo, ContactMessage
+from hardware import views as hardware_views
+from hardware.models import Device, DistributorInfo, Feature, OfficeAddress
+from home import views as home_views
+from home.models import (
+    AppFeature, Award, Certification, Stat, Testimonial, WhyChooseFeature
+)
+from modules import views as module_views
+from modules.models import Module
+from . import checks, http, images, purge, routers, search, snapshots, timing, warmup
+from .backends import pool
+from .benchmark import runner, seed
+from .backends.sqlite3.base import DatabaseWrapper as PooledSQLiteWrapper
+from .query_plans import find_plan_problems
+from .views import SiteView, gather_sections
+from .models import ImageDerivative
+
+
+class SnapshotPublishTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+        settings_override = override_settings(API_SNAPSHOT_ROOT=self.root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        Module.objects.create(
+            name="Payroll", hero_heading="Payroll", hero_description="Pay people",
+            content="<p>Body</p>", icon_name="BanknotesIcon",
+        )
+
+    def test_publish_writes_compressed_variants(self):
+        written = snapshots.publish()
+        self.assertIn('/api/modules/payroll/', written)
+        target = self.root / 'api' / 'home' / 'index.json'
+        body = target.read_bytes()
+        self.assertIn('hero', json.loads(body))
+        self.assertEqual(gzip.decompress(target.with_name('index.json.gz').read_bytes()), body)
+
+    def test_publish_only_rewrites_changed_snapshots(self):
+        snapshots.publish()
+        self.assertEqual(snapshots.publish(), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            Stat.objects.create(value="24/7", label="SUPPORT")
+        self.assertEqual(snapshots.publish(), ['/api/home/'])
+
+    def test_unchanged_bodies_are_not_rewritten_after_a_stamp_reset(self):
+        snapshots.publish()
+        cache.clear()  # e.g. a fresh cache: every stamp starts over
+        self.assertEqual(snapshots.publish(), [])
+
+    @override_settings(API_SNAPSHOT_DELAY=60)
+    def test_changes_are_published_in_one_background_batch(self):
+        publisher = snapshots.Publisher()
+        with mock.patch.object(snapshots, 'publisher', publisher), \
+                mock.patch.object(snapshots, 'publish', return_value=[]) as publish:
+            for label in ('home.Stat', 'home.Stat', 'clients.Client'):
+                snapshots.publish_on_change(None, label=label)
+            publish.assert_not_called()
+            self.assertIsNotNone(publisher.timer)
+            publisher.flush()
+        publish.assert_called_once_with(labels=['clients.Client', 'home.Stat'])
+        self.assertIsNone(publisher.timer)
+
+    def test_removed_module_snapshot_is_pruned(self):
+        snapshots.publish()
+        with self.captureOnCommitCallbacks(execute=True):
+            Module.objects.all().delete()
+        snapshots.publish()
+        self.assertFalse((self.root / 'api' / 'modules' / 'payroll' / 'index.json').exists())
+
+
+class ImageDerivativeTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.name = self.save_png('clients/logos/acme.png', (300, 150))
+
+    def save_png(self, name, size):
+        out = BytesIO()
+        Image.new('RGBA', size, (200, 30, 30, 128)).save(out, 'PNG')
+        return default_storage.save(name, ContentFile(out.getvalue()))
+
+    def test_generate_writes_widths_up_to_original(self):
+        derivative = images.generate(self.name)
+        self.assertEqual([w for path, w in derivative.variants['webp']], [64, 128, 256, 300])
+        self.assertEqual(set(derivative.variants), {ext for ext, fmt in images.get_formats()})
+        for path, width in derivative.variants['jpeg']:
+            with default_storage.open(path) as f:
+                self.assertEqual(Image.open(f).width, width)
+
+    def test_generate_is_idempotent(self):
+        images.generate(self.name)
+        with self.assertNumQueries(1):
+            self.assertIsNone(images.generate(self.name))
+        self.assertEqual(ImageDerivative.objects.count(), 1)
+
+    def test_same_content_shares_files(self):
+        first = images.generate(self.name)
+        copy = self.save_png('devices/acme.png', (300, 150))
+        second = images.generate(copy)
+        self.assertEqual(second.variants, first.variants)
+
+    def test_get_srcsets(self):
+        images.generate(self.name)
+        srcsets = images.get_srcsets([Client(logo=self.name).logo])
+        self.assertRegex(srcsets[self.name]['webp'], r'^/media/derivatives/.+/64\.webp 64w, ')
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Module.objects.create(
+            name="Payroll", hero_heading="Payroll", hero_description="Run payroll in minutes",
+            content="<p>Tax &amp; <b>salary</b> slips for every employee.</p>",
+            icon_name="BanknotesIcon",
+        )
+        Device.objects.create(
+            name="SpeedFace V5L", tagline="Face and palm terminal",
+            specs=["Fingerprint sensor", "Wi-Fi"], order=1,
+        )
+
+    def get_results(self, q):
+        return self.client.get(reverse('search'), {'q': q}).json()['results']
+
+    def test_matches_stripped_html_with_highlight(self):
+        results = self.get_results('salary')
+        self.assertEqual([(r['type'], r['url']) for r in results], [('module', '/modules/payroll')])
+        self.assertIn('Tax &amp; <mark>salary</mark> slips', results[0]['snippet'])
+
+    def test_all_words_must_match_and_last_is_a_prefix(self):
+        self.assertEqual([r['title'] for r in self.get_results('finger')], ["SpeedFace V5L"])
+        self.assertEqual(self.get_results('fingerprint payroll'), [])
+
+    def test_limit_is_clamped(self):
+        for limit in ('-1', '0'):
+            response = self.client.get(reverse('search'), {'q': 'payroll', 'limit': limit})
+            self.assertEqual(len(response.json()['results']), 1)
+
+    def test_title_matches_rank_first(self):
+        Module.objects.create(
+            name="Attendance", hero_heading="Attendance", hero_description="Sync with payroll",
+            content="", icon_name="ClockIcon", slug="attendance",
+        )
+        self.assertEqual([r['title'] for r in self.get_results('payroll')], ["Payroll", "Attendance"])
+
+    def test_changed_model_is_reindexed(self):
+        self.get_results('payroll')
+        with self.captureOnCommitCallbacks(execute=True):
+            Module.objects.all().delete()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_results('payroll'), [])
+        with self.assertNumQueries(0):
+            self.get_results('fingerprint')
+
+
+class SearchIndexConcurrencyTests(SimpleTestCase):
+    def test_searches_while_reindexing(self):
+        index = search.SearchIndex()
+        index.register('test.Doc', lambda: (
+            search.Document('t', i, f"Doc {i}", '/', [(f"term{i % 50} common word{i}", 1)], "common")
+            for i in range(500)
+        ))
+        index.refresh()
+        errors = []
+        stop = threading.Event()
+
+        def read():
+            while not stop.is_set():
+                try:
+                    index.search('common term')
+                except Exception as e:
+                    errors.append(e)
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for thread in readers:
+            thread.start()
+        try:
+            for _ in range(20):
+                with index.lock:
+                    index.reindex('test.Doc')
+        finally:
+            stop.set()
+            for thread in readers:
+                thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(index.search('common term')), 10)
+
+
+class QueryPlanTests(TestCase):
+    """Every public endpoint must stay index-backed as the tables grow."""
+    rows = 150
+    threshold = 100
+    urls = [
+        '/api/home/', '/api/hardware/', '/api/modules/', '/api/modules/module-0/',
+        '/api/categories/', '/api/clients/', '/api/contact-info/',
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        n = range(cls.rows)
+        category = Category.objects.create(name="Category")
+        Category.objects.bulk_create(Category(name=f"Category {i}", order=i) for i in n)
+        Client.objects.bulk_create(
+            Client(name=f"Client {i}", order=i % 7, category=category, is_active=i % 5 > 0)
+            for i in n
+        )
+        Module.objects.bulk_create(
+            Module(name=f"Module {i}", slug=f"module-{i}", hero_heading="h",
+                   hero_description="d", content="c", icon_name="i", order=i % 7)
+            for i in n
+        )
+        Feature.objects.bulk_create(Feature(title="t", description="d", order=i) for i in n)
+        Device.objects.bulk_create(Device(name="d", tagline="t", specs=["s"], order=i) for i in n)
+        OfficeAddress.objects.bulk_create(
+            OfficeAddress(location_name="l", address_line1="a", order=i) for i in n
+        )
+        WhyChooseFeature.objects.bulk_create(WhyChooseFeature(title="t", order=i) for i in n)
+        AppFeature.objects.bulk_create(AppFeature(description="d", order=i) for i in n)
+        Stat.objects.bulk_create(Stat(value="1", label="l", order=i) for i in n)
+        Testimonial.objects.bulk_create(
+            Testimonial(quote="q", author_name="a", author_title="t", order=i) for i in n
+        )
+        Certification.objects.bulk_create(Certification(name="c", image="c.png", order=i) for i in n)
+        Award.objects.bulk_create(Award(name="a", image="a.png", order=i) for i in n)
+
+    def test_unindexed_sort_is_reported(self):
+        ContactMessage.objects.bulk_create(
+            ContactMessage(name="n", email="a@b.c", subject="s", message="m")
+            for i in range(self.rows)
+        )
+        with CaptureQueriesContext(connection) as queries:
+            list(ContactMessage.objects.order_by('subject'))
+        problems = find_plan_problems(connection, queries.captured_queries, self.threshold)
+        self.assertEqual(len(problems), 1)
+
+    def test_endpoints_use_indexes(self):
+        for url in self.urls:
+            cache.clear()
+            with self.subTest(url=url), CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get(url).status_code, 200)
+                problems = find_plan_problems(connection, queries.captured_queries, self.threshold)
+                self.assertEqual(problems, [])
+
+
+class AsyncViewTests(TransactionTestCase):
+    """The async views must answer exactly like the sync ones."""
+    views = [
+        ('/api/hardware/', hardware_views.HardwareView, hardware_views.HardwareAsyncView, {}),
+        ('/api/modules/', module_views.ModuleListView, module_views.ModuleListAsyncView, {}),
+        ('/api/modules/payroll/', module_views.ModuleDetailView,
+         module_views.ModuleDetailAsyncView, {'slug': 'payroll'}),
+        ('/api/modules/nope/', module_views.ModuleDetailView,
+         module_views.ModuleDetailAsyncView, {'slug': 'nope'}),
+        ('/api/categories/', client_views.CategoryListView, client_views.CategoryListAsyncView, {}),
+        ('/api/clients/?limit=2', client_views.ClientListView, client_views.ClientListAsyncView, {}),
+        ('/api/contact-info/', contact_views.ContactInfoView, contact_views.ContactInfoAsyncView, {}),
+    ]
+
+    def setUp(self):
+        cache.clear()
+        Module.objects.create(
+            name="Payroll", hero_heading="Payroll", hero_description="Pay people",
+            content="<p>Body</p>", icon_name="BanknotesIcon",
+        )
+        Feature.objects.create(title="Cloud", description="Anywhere")
+        Device.objects.create(name="F22", tagline="Compact", specs=["Fingerprint", "RFID"])
+        OfficeAddress.objects.create(location_name="Lahore", address_line1="Main Blvd")
+        Category.objects.create(name="Banking")
+        for i in range(3):
+            Client.objects.create(name=f"Client {i}")
+        Stat.objects.create(value="1,300+", label="ORGANIZATIONS")
+        # create the singletons up front so the first request doesn't bump them
+        ContactInfo.load()
+        DistributorInfo.load()
+
+    async def test_async_views_match_sync_views(self):
+        factory = AsyncRequestFactory()
+        for url, sync_view, async_view, kwargs in self.views:
+            with self.subTest(url=url):
+                expected = await sync_to_async(sync_view.as_view())(factory.get(url), **kwargs)
+                response = await async_view.as_view()(factory.get(url), **kwargs)
+                self.assertEqual(response.status_code, expected.status_code)
+                self.assertEqual(response.content, expected.content)
+                self.assertEqual(response['ETag'], expected['ETag'])
+
+    async def test_home_async_view(self):
+        factory = AsyncRequestFactory()
+        response = await home_views.HomePageAsyncView.as_view()(factory.get('/api/home/'))
+        data = json.loads(response.content)
+        self.assertEqual(data['stats'], [{'value': "1,300+", 'label': "ORGANIZATIONS"}])
+        self.assertEqual(len(data['clients']), 3)
+        expected = await sync_to_async(home_views.HomePageView().build)()
+        self.assertEqual({k: v for k, v in data.items() if k != 'clients'}, json.loads(json.dumps(expected)))
+
+    async def test_async_view_answers_304(self):
+        factory = AsyncRequestFactory()
+        view = hardware_views.HardwareAsyncView.as_view()
+        etag = (await view(factory.get('/api/hardware/')))['ETag']
+        response = await view(factory.get('/api/hardware/', headers={'If-None-Match': etag}))
+        self.assertEqual(response.status_code, 304)
+
+
+    @override_settings(API_SECTION_CONCURRENCY=2)
+    async def test_section_fan_out_is_capped(self):
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def section(i):
+            with lock:
+                running.append(i)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.remove(i)
+            return i
+
+        results = await gather_sections({i: partial(section, i) for i in range(6)})
+        self.assertEqual(results, {i: i for i in range(6)})
+        self.assertEqual(max(peak), 2)
+
+class ConnectionPoolTests(SimpleTestCase):
+    alias = 'pool-test'
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.addCleanup(pool._pools.pop, self.alias, None)
+        self.settings_dict = {
+            **connection.settings_dict,
+            'ENGINE': 'core.backends.sqlite3',
+            'NAME': str(Path(self.dir) / 'pool.sqlite3'),
+            'CONN_MAX_AGE': 0,
+            'POOL': {'MAX_SIZE': 1, 'TIMEOUT': 0.05, 'HEALTH_CHECK_AFTER': 30},
+        }
+        self.db = self.make_wrapper()
+
+    def tearDown(self):
+        self.db.close()
+        self.db.pool.clear()
+
+    def make_wrapper(self):
+        return PooledSQLiteWrapper(self.settings_dict, alias=self.alias)
+
+    def get(self, path):
+        """One request through the WSGI handler, request signals included."""
+        environ = {
+            'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '',
+            'SERVER_NAME': 'testserver', 'SERVER_PORT': '80', 'HTTP_HOST': 'testserver',
+            'wsgi.url_scheme': 'http', 'wsgi.input': BytesIO(), 'wsgi.errors': BytesIO(),
+        }
+        statuses = []
+        response = WSGIHandler()(environ, lambda status, headers: statuses.append(status))
+        b''.join(response)
+        response.close()
+        return statuses[0]
+
+    def test_sequential_requests_reuse_one_connection(self):
+        with self.db.schema_editor(atomic=False) as editor:
+            editor.create_model(Category)
+        self.db.close()
+        cache.clear()
+        original = connections['default']
+        connections['default'] = self.db
+        try:
+            raw_ids = set()
+            for _ in range(5):
+                cache.clear()  # each request builds the list from the database
+                self.assertEqual(self.get(reverse('category-list')), '200 OK')
+                # request_finished handed the connection back to the pool
+                self.assertIsNone(self.db.connection)
+                raw_ids.add(id(self.db.pool.idle[-1][0]))
+        finally:
+            connections['default'] = original
+        stats = pool.get_stats()[self.alias]
+        self.assertEqual(len(raw_ids), 1)
+        self.assertEqual(stats['created'], 1)
+        self.assertEqual(stats['checkouts'], 6)
+        self.assertEqual((stats['size'], stats['idle'], stats['in_use']), (1, 1, 0))
+
+    def test_checkout_times_out_when_pool_is_exhausted(self):
+        other = self.make_wrapper()
+        self.db.ensure_connection()
+        with self.assertRaises(pool.PoolTimeout):
+            other.ensure_connection()
+        self.db.close()
+        other.ensure_connection()
+        other.close()
+        stats = self.db.pool.get_stats()
+        self.assertEqual((stats['created'], stats['timeouts'], stats['waits']), (1, 1, 0))
+
+    def test_connections_failing_the_health_check_are_replaced(self):
+        self.settings_dict['POOL']['HEALTH_CHECK_AFTER'] = 0
+        self.db.ensure_connection()
+        self.db.close()
+        self.db.pool.idle[-1][0].close()  # e.g. the server dropped it
+        with self.db.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        stats = self.db.pool.get_stats()
+        self.assertEqual((stats['created'], stats['closed'], stats['health_check_failures']), (2, 1, 1))
+
+    def test_open_transaction_is_rolled_back_on_release(self):
+        self.db.ensure_connection()
+        with self.db.cursor() as cursor:
+            cursor.execute('CREATE TABLE t (x integer)')
+        self.db.set_autocommit(False)
+        with self.db.cursor() as cursor:
+            cursor.execute('INSERT INTO t VALUES (1)')
+        self.db.close()
+        with self.db.cursor() as cursor:
+            cursor.execute('SELECT count(*) FROM t')
+            self.assertEqual(cursor.fetchone(), (0,))
+
+    def test_forked_child_forgets_inherited_connections(self):
+        self.db.ensure_connection()
+        parent_raw = self.db.connection
+        with self.db.cursor() as cursor:
+            cursor.execute('CREATE TABLE t (x integer)')
+        self.db.set_autocommit(False)
+        with self.db.cursor() as cursor:
+            cursor.execute('INSERT INTO t VALUES (1)')
+        with mock.patch('os.getpid', return_value=self.db.pool.pid + 1):
+            # The child gets its own connection even though MAX_SIZE is 1
+            child = self.make_wrapper()
+            child.ensure_connection()
+            self.assertIsNot(child.connection, parent_raw)
+            child.close()
+            # Releasing the inherited one neither rolls it back nor closes it
+            self.db.close()
+        self.assertTrue(parent_raw.in_transaction)
+        parent_raw.rollback()
+        parent_raw.close()
+        stats = self.db.pool.get_stats()
+        self.assertEqual((stats['created'], stats['closed'], stats['size']), (1, 0, 1))
+
+    def test_in_memory_databases_bypass_the_pool(self):
+        db = PooledSQLiteWrapper({**self.settings_dict, 'NAME': ':memory:'}, alias=self.alias)
+        db.ensure_connection()
+        db.close()
+        self.assertEqual(db.pool.get_stats()['checkouts'], 0)
+        self.assertEqual(len(db.pool.idle), 0)
+
+
+@override_settings(DATABASE_REPLICAS={'replica': 1}, DATABASE_REPLICA_LAG=5)
+class ReplicaRoutingTests(SimpleTestCase):
+    """Two SQLite files stand in for the primary and its replica."""
+
+    def setUp(self):
+        cache.clear()
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        for alias in ('default', 'replica'):
+            self.use_sqlite_file(alias)
+            with connections[alias].schema_editor(atomic=False) as editor:
+                editor.create_model(Category)
+            connections[alias].cursor().execute(
+                "INSERT INTO clients_category (name, is_active, \"order\") VALUES (%s, 1, 0)",
+                [alias],
+            )
+
+    def use_sqlite_file(self, alias):
+        settings_dict = {
+            **connection.settings_dict,
+            'NAME': str(Path(self.dir) / f'{alias}.sqlite3'),
+            'TEST': {**connection.settings_dict['TEST'], 'MIRROR': None},
+        }
+        previous_settings = connections.settings.get(alias)
+        previous = connections[alias] if previous_settings else None
+        connections.settings[alias] = settings_dict
+        connections[alias] = connections.create_connection(alias)
+
+        def restore():
+            connections[alias].close()
+            if previous_settings:
+                connections.settings[alias] = previous_settings
+                connections[alias] = previous
+            else:
+                del connections.settings[alias]
+                del connections[alias]
+        self.addCleanup(restore)
+
+    def get_names(self, **extra):
+        response = self.client.get(reverse('category-list'), **extra)
+        return [category['name'] for category in response.json()]
+
+    @override_settings(DATABASE_REPLICAS={'replica': 1, 'default': 3})
+    def test_only_replicas_skip_migrations(self):
+        router = routers.ReplicaRouter()
+        self.assertIsNone(router.allow_migrate('default', 'clients'))
+        self.assertFalse(router.allow_migrate('replica', 'clients'))
+
+    def test_api_reads_go_to_the_replica(self):
+        self.assertEqual(self.get_names(), ['replica'])
+
+    def test_writes_and_admin_use_the_primary(self):
+        factory = RequestFactory()
+        self.assertIsNone(routers.choose_replica(factory.post('/api/contact-message/')))
+        self.assertIsNone(routers.choose_replica(factory.get(reverse('admin:index'))))
+        self.assertEqual(routers.choose_replica(factory.get('/api/home/')), 'replica')
+        with routers.read_from('replica'):
+            category = Category.objects.get()
+            self.assertEqual(category._state.db, 'replica')
+            category.name = 'renamed'
+            category.save()
+        self.assertEqual(Category.objects.using('default').get().name, 'renamed')
+        self.assertEqual(Category.objects.using('replica').get().name, 'replica')
+
+    def test_reads_stay_on_the_primary_after_a_change(self):
+        Category.objects.create(name='new')
+        self.assertEqual(self.get_names(), ['default', 'new'])
+        cache.set(routers.PIN_KEY, 0)  # the lag window is over
+        cache.delete('payload:categories')  # built from the primary
+        self.assertEqual(self.get_names(), ['replica'])
+
+    @override_settings(DATABASE_REPLICAS={'replica': 1, 'default': 0})
+    def test_weighted_selection(self):
+        request = RequestFactory().get('/api/home/')
+        self.assertEqual({routers.choose_replica(request) for _ in range(20)}, {'replica'})
+        with self.settings(DATABASE_REPLICAS={'replica': 1, 'default': 3}):
+            picks = [routers.choose_replica(request) for _ in range(400)]
+        self.assertGreater(picks.count('default'), picks.count('replica'))
+
+
+class ServerTimingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        timing.stats.reset()
+        Feature.objects.create(title="Cloud", description="Anywhere")
+        Device.objects.create(name="F22", tagline="Compact", specs=["Fingerprint"])
+
+    def parse(self, header):
+        entries = {}
+        for entry in header.split(', '):
+            name, *params = entry.split(';')
+            entries[name] = dict(param.split('=', 1) for param in params)
+        return entries
+
+    def test_header_and_histograms(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('hardware'))
+        query_count = len(queries)
+        entries = self.parse(response['Server-Timing'])
+        self.assertEqual(entries['db']['desc'], f'"{query_count} queries"')
+        self.assertGreaterEqual(float(entries['serialize']['dur']), 0)
+        self.assertGreaterEqual(float(entries['view']['dur']), float(entries['db']['dur']))
+
+        self.client.get(reverse('hardware'))
+        stats = timing.get_stats()['hardware']
+        self.assertEqual(stats['view_ms']['count'], 2)
+        self.assertEqual(stats['queries']['max'], query_count)
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_not_timed(self):
+        response = self.client.get(reverse('hardware'))
+        self.assertFalse(response.has_header('Server-Timing'))
+        self.assertEqual(timing.get_stats(), {})
+
+    def test_histogram_percentiles(self):
+        histogram = timing.Histogram(timing.MS_BUCKETS)
+        for value in [0.5] * 90 + [30] * 9 + [7000]:
+            histogram.observe(value)
+        self.assertEqual(histogram.percentile(50), 1)
+        self.assertEqual(histogram.percentile(95), 50)
+        self.assertEqual(histogram.percentile(100), 7000)
+        self.assertEqual(histogram.as_dict()['buckets']['+Inf'], 1)
+
+
+class BenchmarkTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_seed_is_reproducible(self):
+        seed.seed(clients=30, modules=2, module_size=2000, random_seed=1)
+        first = list(Client.objects.values_list('name', 'category__name', 'is_active'))
+        rows = seed.seed(clients=30, modules=2, module_size=2000, random_seed=1)
+        self.assertEqual(list(Client.objects.values_list('name', 'category__name', 'is_active')), first)
+        self.assertEqual((rows['clients.Client'], rows['modules.Module']), (30, 2))
+        self.assertGreaterEqual(len(Module.objects.get(slug='module-0').content), 2000)
+
+    def test_run_in_process(self):
+        seed.seed(clients=30, modules=2, module_size=2000)
+        paths = runner.get_endpoints()
+        self.assertIn('/api/modules/module-0/', paths)
+        results = runner.run_in_process(paths, requests=4, concurrency=2, warmup=1)
+        self.assertEqual([result['path'] for result in results], paths)
+        for result in results:
+            self.assertEqual((result['requests'], result['errors']), (4, 0), result['path'])
+            self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+            self.assertIsNotNone(result['queries'])
+        # Paginated lists aren't payload-cached, every request queries
+        clients = next(result for result in results if result['path'] == '/api/clients/?limit=50')
+        self.assertGreater(clients['queries'], 0)
+
+
+    def test_seeded_benchmark_leaves_the_configured_database_alone(self):
+        tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp)
+        settings_dict = {
+            **connection.settings_dict,
+            'NAME': str(tmp / 'primary.sqlite3'),
+            'TEST': {**connection.settings_dict['TEST'], 'NAME': str(tmp / 'scratch.sqlite3')},
+        }
+        original = connections['default']
+        connections['default'] = connections.create_connection('default')
+        connections['default'].settings_dict = settings_dict
+        self.addCleanup(connections.__setitem__, 'default', original)
+        # create_test_db() records the database it switched to in settings
+        patcher = mock.patch.dict(settings.DATABASES['default'])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        with connection.schema_editor(atomic=False) as editor:
+            editor.create_model(Category)
+        Category.objects.create(name='Real', order=0)
+
+        call_command(
+            'benchmark', seed=True, clients=5, modules=1, module_size=100, requests=1,
+            warmup=0, concurrency=1, paths=['/api/categories/'], interactive=False,
+            verbosity=0, stdout=StringIO(),
+        )
+        connection.close()
+        self.assertEqual(connection.settings_dict['NAME'], str(tmp / 'primary.sqlite3'))
+        self.assertEqual(list(Category.objects.values_list('name', flat=True)), ['Real'])
+        self.assertFalse((tmp / 'scratch.sqlite3').exists())
+        self.assertEqual(cache.get('version:clients.Client'), None)
+
+    def test_seed_and_url_are_exclusive(self):
+        with self.assertRaises(CommandError):
+            call_command('benchmark', seed=True, url='http://localhost:8000', stdout=StringIO())
+
+
+class JsonLayerTests(TestCase):
+    def test_encoders_agree(self):
+        from datetime import datetime, timezone as tz
+        from decimal import Decimal
+
+        from django.utils.translation import gettext_lazy
+
+        data = {
+            'when': datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=tz.utc),
+            'price': Decimal('1.50'),
+            'label': gettext_lazy('Name'),
+            'items': [1, 'two', None, 3.5],
+            'text': 'Café "☕"\n',
+        }
+        with mock.patch.object(http, 'orjson', None):
+            stdlib = http.dumps(data)
+        self.assertEqual(stdlib, (
+            '{"when":"2024-05-01T12:30:15.123Z","price":"1.50","label":"Name",'
+            '"items":[1,"two",null,3.5],"text":"Café \\"☕\\"\\n"}'
+        ).encode())
+        self.assertEqual(http.dumps(data), stdlib)
+
+    def test_json_response(self):
+        response = http.JsonResponse({'a': 1}, status=201)
+        self.assertEqual((response.status_code, response['Content-Type']), (201, 'application/json'))
+        self.assertEqual(response.content, b'{"a":1}')
+        with self.assertRaises(TypeError):
+            http.JsonResponse([1])
+
+    def test_attach_media(self):
+        ImageDerivative.objects.create(
+            source='clients/logos/a.png', content_hash='x',
+            variants={'webp': [['derivatives/a/64.webp', 64]]},
+        )
+        rows = [
+            {'id': 1, 'logo': 'clients/logos/a.png', 'category_id': 2},
+            {'id': 2, 'logo': '', 'category_id': None},
+            {'id': 3, 'logo': 'clients/logos/a.png', 'category_id': 2},
+        ]
+        with self.assertNumQueries(1):
+            data = http.attach_media(rows, 'logo')
+        self.assertEqual(list(data[0]), ['id', 'logo', 'logo_srcset', 'category_id'])
+        self.assertEqual(data[0]['logo'], '/media/clients/logos/a.png')
+        self.assertEqual(data[0]['logo_srcset'], {'webp': '/media/derivatives/a/64.webp 64w'})
+        self.assertEqual((data[1]['logo'], data[1]['logo_srcset']), (None, None))
+        with self.assertNumQueries(0):
+            self.assertNotIn('logo_srcset', http.attach_media(rows[1:2], 'logo', srcsets=False)[0])
+
+
+class SiteViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            Feature.objects.create(title="Cloud", description="Anywhere")
+            Category.objects.create(name="Banking")
+            Client.objects.create(name="Acme")
+            Stat.objects.create(value="1,300+", label="ORGANIZATIONS")
+            ContactInfo.load()
+            DistributorInfo.load()
+
+    def test_sections_match_their_endpoints(self):
+        data = self.client.get(reverse('site')).json()
+        self.assertEqual(list(data), ['home', 'hardware', 'modules', 'categories', 'clients', 'contact'])
+        for name, url_name in SiteView.sections.items():
+            with self.subTest(section=name):
+                expected = self.client.get(reverse(url_name)).json()
+                if name == 'home':
+                    data[name].pop('clients')
+                    expected.pop('clients')
+                self.assertEqual(data[name], expected)
+
+    def test_subset_and_unknown_sections(self):
+        response = self.client.get(reverse('site'), {'sections': 'contact,hardware'})
+        self.assertEqual(list(response.json()), ['contact', 'hardware'])
+        response = self.client.get(reverse('site'), {'sections': 'home,nope'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_only_changed_sections_are_rebuilt(self):
+        url = reverse('site') + '?sections=hardware,contact,categories'
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Feature.objects.create(title="Biometric", description="Fingerprint")
+        with mock.patch('core.views.render', wraps=snapshots.render) as render:
+            data = self.client.get(url).json()
+        render.assert_called_once_with('/api/hardware/')
+        self.assertEqual(len(data['hardware']['features']), 2)
+
+    def test_conditional_get(self):
+        url = reverse('site') + '?sections=contact'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            Feature.objects.create(title="Biometric", description="Fingerprint")
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertNotEqual(self.client.get(reverse('site') + '?sections=hardware')['ETag'], etag)
+
+
+class BatchViewTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        for name in ("Payroll", "Attendance"):
+            Module.objects.create(
+                name=name, hero_heading=name, hero_description="-",
+                content="<p>Body</p>", icon_name="BanknotesIcon",
+            )
+        self.category = Category.objects.create(name="Banking")
+        Client.objects.create(name="Acme", category=self.category)
+        Client.objects.create(name="Other")
+        ContactInfo.load()
+
+    def post(self, data):
+        return self.client.post(reverse('batch'), json.dumps(data), content_type='application/json')
+
+    def test_runs_paths_and_reports_each_status(self):
+        paths = [
+            '/api/modules/payroll/',
+            '/api/modules/attendance/',
+            f'/api/clients/?category={self.category.pk}',
+            '/api/modules/missing/',
+            '/api/nothing-here/',
+            '/api/batch/',
+        ]
+        response = self.post({'paths': paths})
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([r['path'] for r in results], paths)
+        self.assertEqual([r['status'] for r in results], [200, 200, 200, 404, 404, 400])
+        for result in results[:3]:
+            self.assertEqual(result['body'], self.client.get(result['path']).json())
+        self.assertEqual(results[2]['body'][0]['name'], "Acme")
+
+    @override_settings(API_BATCH_TIMEOUT=1.0)
+    def test_time_budget(self):
+        original = contact_views.ContactInfoView.get
+        release, finished = threading.Event(), threading.Event()
+
+        def blocked_get(view, request):
+            try:
+                release.wait(10)
+                return original(view, request)
+            finally:
+                finished.set()
+
+        with mock.patch.object(contact_views.ContactInfoView, 'get', blocked_get):
+            results = self.post(['/api/contact-info/', '/api/categories/']).json()['results']
+            release.set()
+            # let the abandoned worker finish before the tables are flushed
+            finished.wait(10)
+        self.assertEqual([r['status'] for r in results], [504, 200])
+        self.assertEqual(results[0]['body'], {'error': 'Timed out'})
+
+    def test_sub_requests_are_anonymous(self):
+        self.client.force_login(User.objects.create_user('staff', is_staff=True))
+        results = self.post(['/api/db-pool/', '/api/timings/']).json()['results']
+        self.assertEqual([r['status'] for r in results], [403, 403])
+
+    def test_invalid_batches(self):
+        self.assertEqual(self.client.post(reverse('batch'), 'nope', content_type='application/json').status_code, 400)
+        self.assertEqual(self.post({'paths': '/api/home/'}).status_code, 400)
+        self.assertEqual(self.post({'paths': ['/admin/']}).status_code, 400)
+        with self.settings(API_BATCH_MAX_REQUESTS=2):
+            self.assertEqual(self.post(['/api/home/'] * 3).status_code, 400)
+
+
+class StubProxy(ThreadingHTTPServer):
+    """Records purge requests; answers each with ``status``."""
+
+    def __init__(self, status=200):
+        self.status = status
+        self.received = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(handler):
+                body = handler.rfile.read(int(handler.headers['Content-Length']))
+                self.received.append((handler.command, handler.path, handler.headers, json.loads(body)))
+                handler.send_response(self.status)
+                handler.send_header('Content-Length', '0')
+                handler.end_headers()
+
+            def log_message(handler, *args):
+                pass
+
+        super().__init__(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_port}/purge'
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class CachePurgeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.proxy = StubProxy()
+        self.addCleanup(self.proxy.stop)
+        settings_override = override_settings(
+            API_PURGE_URL=self.proxy.url, API_PURGE_DELAY=60, API_PURGE_HEADERS={'Fastly-Key': 'secret'},
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(self.reset_dispatcher)
+
+    def reset_dispatcher(self):
+        with purge.dispatcher.lock:
+            if purge.dispatcher.timer is not None:
+                purge.dispatcher.timer.cancel()
+                purge.dispatcher.timer = None
+            purge.dispatcher.pending.clear()
+
+    def test_api_responses_carry_surrogate_keys(self):
+        response = self.client.get(reverse('hardware'))
+        self.assertEqual(response['Cache-Control'], 'public, max-age=0, s-maxage=86400')
+        response = self.client.get(reverse('home'))
+        # The client strip changes per request, the proxy mustn't freeze it
+        self.assertEqual(response['Cache-Control'], 'public, max-age=0, s-maxage=60')
+        keys = response['Surrogate-Key'].split()
+        self.assertIn('home.Stat', keys)
+        self.assertIn('clients.Client', keys)
+        self.assertEqual(response['Cache-Tag'], ','.join(keys))
+        etag = response['ETag']
+        not_modified = self.client.get(reverse('home'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['Surrogate-Key'], response['Surrogate-Key'])
+        response = self.client.get(reverse('search'), {'q': 'payroll'})
+        self.assertIn('modules.Module', response['Surrogate-Key'].split())
+
+    def test_proxy_keeps_responses_briefly_without_purges(self):
+        with override_settings(API_PURGE_URL=None):
+            response = self.client.get(reverse('hardware'))
+        self.assertEqual(response['Cache-Control'], 'public, max-age=0, s-maxage=60')
+        response = self.client.get(reverse('site'), {'sections': 'hardware'})
+        self.assertEqual(response['Cache-Control'], 'public, max-age=0, s-maxage=86400')
+        response = self.client.get(reverse('site'), {'sections': 'home,hardware'})
+        self.assertEqual(response['Cache-Control'], 'public, max-age=0, s-maxage=60')
+
+    def test_other_api_responses_are_not_stored(self):
+        response = self.client.post(reverse('contact-message'), {})
+        self.assertIn('no-store', response['Cache-Control'])
+        self.assertFalse(response.has_header('Surrogate-Key'))
+        self.assertIn('no-store', self.client.get(reverse('db-pool'))['Cache-Control'])
+
+    def test_changes_are_purged_by_tag(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Stat.objects.create(value="1,300+", label="ORGANIZATIONS")
+            Client.objects.create(name="Acme")
+        self.assertEqual(purge.dispatcher.flush(), ['clients.Client', 'home.Stat'])
+        [(method, path, headers, body)] = self.proxy.received
+        self.assertEqual((method, path), ('POST', '/purge'))
+        self.assertEqual(headers['Surrogate-Key'], 'clients.Client home.Stat')
+        self.assertEqual(headers['Fastly-Key'], 'secret')
+        self.assertEqual(body, {'tags': ['clients.Client', 'home.Stat']})
+        self.assertEqual(purge.dispatcher.flush(), [])
+
+    def test_failed_purges_are_retried(self):
+        self.proxy.status = 503
+        purge.dispatcher.queue('home.Stat')
+        with mock.patch('core.purge.time.sleep') as sleep, self.assertLogs('core.purge', 'ERROR'):
+            purge.dispatcher.flush()
+        self.assertEqual(len(self.proxy.received), purge.dispatcher.attempts)
+        self.assertEqual(sleep.call_count, purge.dispatcher.attempts - 1)
+
+    @override_settings(API_PURGE_URL=None)
+    def test_nothing_is_queued_without_a_purge_url(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Stat.objects.create(value="1", label="ONE")
+        self.assertEqual(purge.dispatcher.flush(), [])
+
+
+class WarmupTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Module.objects.create(
+            name="Payroll", hero_heading="Payroll", hero_description="Pay people",
+            content="<p>Body</p>", icon_name="BanknotesIcon",
+        )
+        Feature.objects.create(title="Cloud", description="Anywhere")
+        ContactInfo.load()
+        DistributorInfo.load()
+
+    def test_warm_builds_every_payload(self):
+        results = warmup.warm()
+        names = [r['name'] for r in results]
+        self.assertEqual(names[0], '/api/site/')
+        self.assertIn('/api/modules/payroll/', names)
+        self.assertEqual(names[-1], 'search index')
+        self.assertTrue(all(r['error'] is None and r['ms'] >= 0 for r in results))
+        with self.assertNumQueries(0):
+            self.client.get(reverse('site'), {'sections': 'hardware,contact'})
+
+    def test_warmed_endpoints_are_served_from_the_cache(self):
+        warmup.warm()
+        for path in snapshots.get_snapshot_paths():
+            if path == '/api/home/':
+                continue  # the client strip is drawn per request
+            with self.subTest(path=path), self.assertNumQueries(0):
+                self.assertEqual(self.client.get(path).status_code, 200)
+        request = RequestFactory().get('/api/modules/payroll/')
+        with self.assertNumQueries(0):
+            response = async_to_sync(module_views.ModuleDetailAsyncView.as_view())(request, slug='payroll')
+        self.assertEqual(response.content, self.client.get('/api/modules/payroll/').content)
+        # Filtered variants are still built per request
+        with self.assertNumQueries(1):
+            self.client.get(reverse('client-list'), {'limit': 5})
+
+    def test_failures_are_reported(self):
+        def fail():
+            raise ValueError("boom")
+
+        with self.assertLogs('core.warmup', 'ERROR'):
+            results = warmup.warm([('ok', lambda: None), ('bad', fail)])
+        self.assertEqual([(r['name'], r['error']) for r in results], [('ok', None), ('bad', 'boom')])
+
+    def test_command_reports_timings(self):
+        out = StringIO()
+        call_command('warm_caches', stdout=out)
+        self.assertIn('/api/hardware/', out.getvalue())
+        self.assertIn('Warmed', out.getvalue())
+        with mock.patch('core.snapshots.render', side_effect=ValueError("boom")):
+            with self.assertRaises(CommandError), self.assertLogs('core.warmup', 'ERROR'):
+                call_command('warm_caches', stdout=StringIO(), stderr=StringIO())
+
+    def test_readiness_follows_the_preload(self):
+        preload = warmup.Preload()
+        self.assertEqual(preload.as_dict()['status'], 'idle')
+        release = threading.Event()
+        with mock.patch.object(warmup, 'preload', preload):
+            self.assertEqual(self.client.get(reverse('ready')).status_code, 200)
+            self.assertTrue(preload.start([('slow', release.wait)]))
+            self.assertFalse(preload.start())
+            response = self.client.get(reverse('ready'))
+            self.assertEqual(response.status_code, 503)
+            self.assertIn('no-store', response['Cache-Control'])
+            release.set()
+            for _ in range(100):
+                if preload.is_ready():
+                    break
+                time.sleep(0.01)
+            data = self.client.get(reverse('ready')).json()
+        self.assertEqual(data['status'], 'ready')
+        self.assertEqual([item['name'] for item in data['items']], ['slow'])
+
+    def test_forked_worker_restarts_an_interrupted_preload(self):
+        preload = warmup.Preload()
+        release = threading.Event()
+        runs = []
+        items = [('slow', lambda: (runs.append(1), release.wait()))]
+        preload.start(items)
+        # What the child of a fork sees: 'warming', but no thread doing it
+        preload.after_fork()
+        self.assertFalse(preload.is_ready())
+        with mock.patch.object(warmup, 'preload', preload):
+            warmup.resume_after_fork()
+            self.assertFalse(preload.resume())
+        for _ in range(100):
+            if len(runs) == 2:  # warming again in this "process"
+                break
+            time.sleep(0.01)
+        self.assertEqual(len(runs), 2)
+        release.set()
+        for _ in range(100):
+            if preload.is_ready():
+                break
+            time.sleep(0.01)
+        self.assertEqual(preload.as_dict()['status'], 'ready')
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    def run_check(self):
+        return [e.id for e in checks.check_shared_cache(None)]
+
+    def test_per_process_cache_is_reported(self):
+        with self.settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            self.assertEqual(self.run_check(), ['core.W001'])
+        with self.settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache'}}):
+            self.assertEqual(self.run_check(), [])
+
+
+class BrokenCache(BaseCache):
+    """A cache whose server is unreachable."""
+
+    def __init__(self, location, params):
+        super().__init__(params)
+
+    def get(self, *args, **kwargs):
+        raise ConnectionError("cache is down")
+
+    add = set = delete = get_many = set_many = incr = touch = has_key = get
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'core.tests.BrokenCache'}})
+class CacheOutageTests(TestCase):
+    def setUp(self):
+        Stat.objects.create(value="1,300+", label="ORGANIZATIONS")
+
+    def test_api_degrades_to_rebuilding(self):
+        with self.assertLogs('core', 'WARNING'):
+            first = self.client.get(reverse('home'))
+            self.assertEqual(first.status_code, 200)
+            self.assertEqual(first.json()['stats'][0]['value'], "1,300+")
+            # No stamp can be trusted: the ETag never matches
+            again = self.client.get(reverse('home'), HTTP_IF_NONE_MATCH=first['ETag'])
+            self.assertEqual(again.status_code, 200)
+            for name in ('hardware', 'contact-info', 'site'):
+                self.assertEqual(self.client.get(reverse(name)).status_code, 200)
+
+    def test_saves_still_succeed(self):
+        with self.assertLogs('core.versions', 'ERROR'), self.captureOnCommitCallbacks(execute=True):
+            Stat.objects.create(value="24/7", label="SUPPORT")
+        self.assertEqual(Stat.objects.count(), 2)
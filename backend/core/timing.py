@@ -0,0 +1,180 @@
+"""
+Per-request timings: DB queries, DB time, JSON serialization and view time.
+
+ServerTimingMiddleware samples a share of requests (SERVER_TIMING_SAMPLE_RATE)
+and, for those, sends the numbers as a ``Server-Timing`` header and records
+them in per-URL-name histograms kept in process memory (``get_stats()``).
+
+Query timing uses a connection execute wrapper that is installed on every
+connection once and does nothing for requests that are not sampled. The
+current timer is held in a context variable, so queries run by
+gather_sections() worker threads count towards the request too.
+"""
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Upper bounds of the histogram buckets, the last bucket is unbounded
+MS_BUCKETS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+_current = ContextVar('request_timer', default=None)
+
+
+class RequestTimer:
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.serialize = 0.0
+        self.lock = threading.Lock()
+
+    def add(self, name, seconds, queries=0):
+        with self.lock:
+            setattr(self, name, getattr(self, name) + seconds)
+            self.queries += queries
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def percentile(self, pct):
+        """Upper bound of the bucket holding the ``pct``th percentile."""
+        if not self.count:
+            return None
+        rank = self.count * pct / 100
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'mean': self.sum / self.count if self.count else None,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'max': self.max,
+            'buckets': dict(zip([*map(str, self.buckets), '+Inf'], self.counts)),
+        }
+
+
+class TimingStats:
+    """Histograms of view/db/serialize milliseconds and queries per URL name."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+
+    def record(self, url_name, view_ms, timer):
+        with self.lock:
+            if url_name not in self.histograms:
+                self.histograms[url_name] = {
+                    'view_ms': Histogram(MS_BUCKETS),
+                    'db_ms': Histogram(MS_BUCKETS),
+                    'serialize_ms': Histogram(MS_BUCKETS),
+                    'queries': Histogram(QUERY_BUCKETS),
+                }
+            histograms = self.histograms[url_name]
+            histograms['view_ms'].observe(view_ms)
+            histograms['db_ms'].observe(timer.db * 1000)
+            histograms['serialize_ms'].observe(timer.serialize * 1000)
+            histograms['queries'].observe(timer.queries)
+
+    def as_dict(self):
+        with self.lock:
+            return {
+                url_name: {metric: h.as_dict() for metric, h in histograms.items()}
+                for url_name, histograms in self.histograms.items()
+            }
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+
+
+stats = TimingStats()
+
+
+def get_stats():
+    return stats.as_dict()
+
+
+def execute_wrapper(execute, sql, params, many, context):
+    timer = _current.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timer.add('db', time.perf_counter() - start, queries=1)
+
+
+def install(connection, **kwargs):
+    """connection_created receiver: time the connection's queries."""
+    if execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(execute_wrapper)
+
+
+@contextmanager
+def track(timer):
+    """Count queries and serialization in the block towards ``timer``."""
+    token = _current.set(timer)
+    try:
+        yield timer
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def measure(name):
+    """Add the time spent in the block to the current request's ``name``."""
+    timer = _current.get()
+    if timer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(name, time.perf_counter() - start)
+
+
+def start_request():
+    """A timer for a sampled request, else None."""
+    rate = getattr(settings, 'SERVER_TIMING_SAMPLE_RATE', 1.0)
+    if rate <= 0 or (rate < 1 and random.random() >= rate):
+        return None
+    return RequestTimer()
+
+
+def finish_request(request, response, timer, view_seconds):
+    view_ms = view_seconds * 1000
+    match = getattr(request, 'resolver_match', None)
+    stats.record(match.url_name if match and match.url_name else '<unresolved>', view_ms, timer)
+    if getattr(settings, 'SERVER_TIMING_HEADER', True):
+        response.headers['Server-Timing'] = ', '.join([
+            f'db;dur={timer.db * 1000:.2f};desc="{timer.queries} queries"',
+            f'serialize;dur={timer.serialize * 1000:.2f}',
+            f'view;dur={view_ms:.2f}',
+        ])
+    return response
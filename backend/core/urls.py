@@ -0,0 +1,11 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('api/site/', views.SiteView.as_view(), name='site'),
+    path('api/batch/', views.BatchView.as_view(), name='batch'),
+    path('api/search/', views.SearchView.as_view(), name='search'),
+    path('api/db-pool/', views.DatabasePoolView.as_view(), name='db-pool'),
+    path('api/timings/', views.TimingStatsView.as_view(), name='timings'),
+    path('api/ready/', views.ReadinessView.as_view(), name='ready'),
+]
@@ -0,0 +1,84 @@
+"""
+Change stamps for content models.
+
+Every tracked model gets a stamp in the Django cache that moves forward on
+each save/delete. Cached payloads remember the stamps they were built from
+and are rebuilt once any of them moves, so all workers sharing the cache see
+an admin edit without restarting.
+
+If the cache is unreachable, saves are logged and every lookup returns a
+fresh stamp: payloads are rebuilt and ETags never match, so an outage costs
+speed but never serves stale content or errors.
+"""
+import logging
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal
+
+KEY_PREFIX = 'version:'
+
+logger = logging.getLogger(__name__)
+
+# Sent once a model's stamp moved, after the change was committed.
+# Receivers get ``label``, e.g. 'home.Stat'.
+content_changed = Signal()
+
+
+def get_label(model):
+    return model if isinstance(model, str) else model._meta.label
+
+
+def get_key(model):
+    return KEY_PREFIX + get_label(model)
+
+
+def bump(model):
+    key = get_key(model)
+    try:
+        cache.set(key, max(time.time_ns(), (cache.get(key) or 0) + 1), None)
+    except Exception:
+        logger.exception("Could not bump the change stamp of %s", get_label(model))
+    content_changed.send(sender=bump, label=get_label(model))
+
+
+def get_versions(models, found=None):
+    """
+    Return {label: stamp} for the given models.
+
+    ``found`` may hold the result of a cache.get_many() that already
+    included the version keys, to save a round trip.
+    """
+    keys = {get_key(m): get_label(m) for m in models}
+    try:
+        if found is None:
+            found = cache.get_many(list(keys))
+        missing = [key for key in keys if key not in found]
+        if missing:
+            # Cold cache: start the stamps now, without clobbering one that
+            # another worker may have bumped in the meantime.
+            now = time.time_ns()
+            for key in missing:
+                cache.add(key, now, None)
+            found = {**found, **cache.get_many(missing)}
+    except Exception:
+        logger.warning("Change stamps unavailable, nothing can be reused", exc_info=True)
+        now = time.time_ns()
+        return {label: now for label in keys.values()}
+    return {label: found.get(key, 0) for key, label in keys.items()}
+
+
+def _on_change(sender, **kwargs):
+    # Bump after commit so a request racing the admin transaction can't
+    # cache the old rows under the new stamp.
+    transaction.on_commit(lambda: bump(sender))
+
+
+def track(*models):
+    """Bump the stamp of each model whenever one of its rows changes."""
+    for model in models:
+        uid = 'versions:' + get_label(model)
+        post_save.connect(_on_change, sender=model, dispatch_uid=uid)
+        post_delete.connect(_on_change, sender=model, dispatch_uid=uid)
@@ -0,0 +1,247 @@
+import asyncio
+import hashlib
+import json
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import HttpResponse
+from django.urls import resolve, reverse
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+
+from . import batch, purge, search, timing, versions, warmup
+from .backends import pool
+from .cache import cached_bodies
+from .http import JsonResponse, dumps
+from .snapshots import get_depends_on, get_payload_name, render
+
+
+def get_request_versions(request, models):
+    """Change stamps for ``models``, looked up once per request."""
+    if not hasattr(request, '_content_versions'):
+        request._content_versions = versions.get_versions(models)
+    return request._content_versions
+
+
+def get_validators(stamps, weak=False):
+    """
+    ETag and Last-Modified (epoch seconds) for a set of change stamps. A
+    ``weak`` ETag (W/"...") is for bodies that are equivalent but not
+    byte-identical under the same stamps.
+    """
+    raw = ','.join(f'{label}={stamp}' for label, stamp in sorted(stamps.items()))
+    etag = quote_etag(hashlib.md5(raw.encode()).hexdigest())
+    if weak:
+        etag = 'W/' + etag
+    last_modified = max(stamps.values()) // 10**9 if stamps else None
+    return etag, last_modified
+
+
+def set_validators(response, etag, last_modified):
+    if last_modified and not response.has_header('Last-Modified'):
+        response.headers['Last-Modified'] = http_date(last_modified)
+    response.headers.setdefault('ETag', etag)
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    Conditional GET for views whose output only depends on the rows of the
+    models listed in ``depends_on`` (all registered with versions.track()).
+
+    ETag/Last-Modified come from the models' change stamps, and a matching
+    If-None-Match/If-Modified-Since gets a 304 before the view builds
+    anything. Works for sync and async handlers. Views whose body varies
+    between requests with the same stamps set ``weak_etag``.
+    """
+    depends_on = ()
+    weak_etag = False
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        if self.view_is_async:
+            return self.async_dispatch(request, *args, **kwargs)
+        etag, last_modified = get_validators(get_request_versions(request, self.depends_on), self.weak_etag)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+        purge.set_cache_headers(response, self.depends_on, self.weak_etag)
+        return set_validators(response, etag, last_modified)
+
+    async def async_dispatch(self, request, *args, **kwargs):
+        stamps = await sync_to_async(get_request_versions)(request, self.depends_on)
+        etag, last_modified = get_validators(stamps, self.weak_etag)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = await super().dispatch(request, *args, **kwargs)
+        purge.set_cache_headers(response, self.depends_on, self.weak_etag)
+        return set_validators(response, etag, last_modified)
+
+
+def run_section(section):
+    try:
+        return section()
+    finally:
+        # Each worker thread holds its own connection
+        close_old_connections()
+
+
+async def gather_sections(sections):
+    """
+    Run independent sync ``{name: callable}`` sections concurrently.
+
+    Django 4.2's async ORM funnels every query through one shared thread, so
+    awaiting several of them at once would still run them one by one; each
+    section gets its own worker thread (and DB connection) instead. At most
+    API_SECTION_CONCURRENCY run at once, so a request never holds more than
+    that many pooled connections.
+    """
+    limit = asyncio.Semaphore(getattr(settings, 'API_SECTION_CONCURRENCY', 2))
+
+    async def run(section):
+        async with limit:
+            return await sync_to_async(run_section, thread_sensitive=False)(section)
+
+    results = await asyncio.gather(*(run(section) for section in sections.values()))
+    return dict(zip(sections, results))
+
+
+def api_view(view_class, async_view_class):
+    """
+    The view for an API URL: the async implementation when the process
+    serves ASGI (API_ASYNC_VIEWS, set by backend/asgi.py), else the sync one.
+    """
+    if getattr(settings, 'API_ASYNC_VIEWS', False):
+        return async_view_class.as_view()
+    return view_class.as_view()
+
+
+class SiteView(ConditionalGetMixin, View):
+    """
+    Several endpoints in one response: ``?sections=home,hardware,contact``
+    (every section by default) returns ``{"home": <body of /api/home/>, ...}``.
+
+    Each section is the cached body of its own view (its ``payload_name``,
+    so /api/site/ and the endpoint share one cache entry), looked up in one
+    round trip; an edit only rebuilds the sections built from it.
+    """
+    # Section -> URL name of the view that renders it
+    sections = {
+        'home': 'home',
+        'hardware': 'hardware',
+        'modules': 'module-list',
+        'categories': 'category-list',
+        'clients': 'client-list',
+        'contact': 'contact-info',
+    }
+    # Rendered every time: home draws its client strip per request
+    uncached = {'home'}
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        self.requested = self.get_requested(request)
+        self.paths = {name: reverse(self.sections[name]) for name in self.requested or ()}
+        self.weak_etag = any(
+            getattr(resolve(path).func.view_class, 'weak_etag', False) for path in self.paths.values()
+        )
+        self.depends_on = tuple(dict.fromkeys(
+            model for path in self.paths.values() for model in get_depends_on(path)
+        ))
+
+    def get_requested(self, request):
+        """Requested section names in order, None if one is unknown."""
+        requested = request.GET.get('sections')
+        if not requested:
+            return list(self.sections)
+        names = list(dict.fromkeys(name.strip() for name in requested.split(',') if name.strip()))
+        if any(name not in self.sections for name in names):
+            return None
+        return names
+
+    def get(self, request):
+        if self.requested is None:
+            return JsonResponse(
+                {'error': f"Unknown section, choose from: {', '.join(self.sections)}"}, status=400,
+            )
+        cached = cached_bodies({
+            get_payload_name(path): (get_depends_on(path), partial(render, path))
+            for name, path in self.paths.items() if name not in self.uncached
+        })
+        parts = []
+        for name, path in self.paths.items():
+            body = cached[get_payload_name(path)] if name not in self.uncached else render(path)
+            parts.append(dumps(name) + b':' + body)
+        return HttpResponse(b'{' + b','.join(parts) + b'}', content_type='application/json')
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class BatchView(View):
+    """
+    POST ``{"paths": ["/api/modules/payroll/", "/api/clients/?category=2"]}``
+    runs those GETs concurrently (see core/batch.py) and answers
+    ``{"results": [{"path", "status", "body"}, ...]}`` in the same order.
+    """
+
+    def post(self, request):
+        try:
+            data = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({'error': 'Invalid JSON'}, status=400)
+        paths = data.get('paths') if isinstance(data, dict) else data
+        if not isinstance(paths, list) or not all(isinstance(p, str) for p in paths):
+            return JsonResponse({'error': 'paths must be a list of strings'}, status=400)
+        max_paths = getattr(settings, 'API_BATCH_MAX_REQUESTS', 20)
+        if len(paths) > max_paths:
+            return JsonResponse({'error': f'At most {max_paths} paths per batch'}, status=400)
+        if not all(p.startswith('/api/') for p in paths):
+            return JsonResponse({'error': 'Only /api/ paths can be batched'}, status=400)
+        results = batch.run(paths)
+        return HttpResponse(
+            b'{"results":[' + b','.join(results) + b']}', content_type='application/json',
+        )
+
+
+class SearchView(View):
+    def get(self, request):
+        query = request.GET.get('q', '').strip()
+        try:
+            limit = int(request.GET.get('limit', 10))
+        except ValueError:
+            return JsonResponse({'error': 'limit must be a number'}, status=400)
+        limit = max(1, min(limit, 50))
+        results = search.index.search(query, limit) if query else []
+        return purge.set_cache_headers(
+            JsonResponse({'query': query, 'results': results}), list(search.index.sources),
+        )
+
+
+class DatabasePoolView(View):
+    """Connection pool counters of this worker process, for staff."""
+
+    def get(self, request):
+        if not request.user.is_staff:
+            return JsonResponse({'error': 'Forbidden'}, status=403)
+        return JsonResponse({'pools': pool.get_stats()})
+
+
+class TimingStatsView(View):
+    """Server-Timing histograms per URL name of this worker process, for staff."""
+
+    def get(self, request):
+        if not request.user.is_staff:
+            return JsonResponse({'error': 'Forbidden'}, status=403)
+        return JsonResponse({'timings': timing.get_stats()})
+
+
+class ReadinessView(View):
+    """200 once this worker's startup cache warm-up is done, 503 before."""
+
+    def get(self, request):
+        status = 200 if warmup.preload.is_ready() else 503
+        return JsonResponse(warmup.preload.as_dict(), status=status)
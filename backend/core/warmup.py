@@ -0,0 +1,126 @@
+"""
+Cache warm-up after a deploy or worker restart.
+
+Every cacheable API payload is built once through its view (the /api/site/
+sections, /api/home/ and the other snapshot endpoints, plus a detail page
+per module slug), which also starts the change stamps, and the search index
+is filled. With API_WARMUP_ON_START each worker does this in a background
+thread at startup, and /api/ready/ answers 503 until that has finished.
+
+``manage.py warm_caches`` does the same from a separate process. It only
+helps the workers because the payloads and stamps go to the cache they
+share (CACHES, Redis); with a per-process cache (see the core.W001 check)
+it warms nothing but itself. The search index always lives in process
+memory, so only the startup preload fills a worker's.
+
+Threads don't survive fork(): a worker forked while its parent was still
+warming (gunicorn ``--preload``) starts its own warm-up on its first request.
+"""
+import logging
+import os
+import threading
+import time
+from functools import partial
+
+from django.apps import apps
+from django.db import connections
+
+from . import search, snapshots
+
+logger = logging.getLogger(__name__)
+
+
+def get_items():
+    """``[(name, warm)]`` in the order they are warmed."""
+    paths = ['/api/site/', *snapshots.get_snapshot_paths()]
+    items = [(path, partial(snapshots.render, path)) for path in paths]
+    items.append(('search index', search.index.refresh))
+    return items
+
+
+def warm(items=None):
+    """Run each warm-up item and return ``[{'name', 'ms', 'error'}]``."""
+    results = []
+    for name, func in get_items() if items is None else items:
+        start = time.perf_counter()
+        error = None
+        try:
+            func()
+        except Exception as e:
+            logger.exception("Warming %s failed", name)
+            error = str(e) or type(e).__name__
+        results.append({'name': name, 'ms': (time.perf_counter() - start) * 1000, 'error': error})
+    return results
+
+
+class Preload:
+    """Background warm-up of this worker process, reported by /api/ready/."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.status = 'idle'
+        self.results = []
+        self.seconds = None
+        self.items = None
+        self.interrupted = False
+
+    def start(self, items=None):
+        with self.lock:
+            if self.status == 'warming':
+                return False
+            self.status = 'warming'
+            self.items = items
+        self.spawn()
+        return True
+
+    def spawn(self):
+        threading.Thread(target=self.run, args=(self.items,), name='cache-warmup', daemon=True).start()
+
+    def run(self, items):
+        # Started from AppConfig.ready(): wait until every app is loaded
+        apps.ready_event.wait()
+        start = time.perf_counter()
+        try:
+            results = warm(items)
+        finally:
+            connections.close_all()
+        with self.lock:
+            self.results = results
+            self.seconds = time.perf_counter() - start
+            self.status = 'ready'
+        failed = sum(1 for r in results if r['error'])
+        logger.info("Warmed %d cache item(s) in %.2fs, %d failed", len(results), self.seconds, failed)
+
+    def after_fork(self):
+        """In a forked child, where the warm-up thread no longer runs."""
+        self.lock = threading.Lock()
+        # Still 'warming' (not ready) until resume() runs it again
+        self.interrupted = self.status == 'warming'
+
+    def resume(self):
+        """Restart a warm-up that a fork interrupted; returns whether it did."""
+        with self.lock:
+            if not self.interrupted:
+                return False
+            self.interrupted = False
+        self.spawn()
+        return True
+
+    def is_ready(self):
+        return self.status != 'warming'
+
+    def as_dict(self):
+        with self.lock:
+            return {'status': self.status, 'seconds': self.seconds, 'items': list(self.results)}
+
+
+preload = Preload()
+
+
+def resume_after_fork(**kwargs):
+    """request_started receiver, see Preload.resume()."""
+    preload.resume()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=lambda: preload.after_fork())
@@ -1,5 +1,6 @@
 from django.contrib import admin
 from unfold.admin import ModelAdmin  # Correct Unfold import
+from .forms import DeviceAdminForm
 from .models import Feature, Device, DistributorInfo, OfficeAddress
 
 @admin.register(Feature)
@@ -10,9 +11,10 @@ class FeatureAdmin(ModelAdmin):
 
 @admin.register(Device)
 class DeviceAdmin(ModelAdmin): 
+    form = DeviceAdminForm
     list_display = ['name', 'order', 'is_active']
     list_editable = ['order', 'is_active']
-    search_fields = ['name']
+    search_fields = ['name', 'specs']
 
 @admin.register(DistributorInfo)
 class DistributorInfoAdmin(ModelAdmin): 
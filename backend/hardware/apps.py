@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class HardwareConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'hardware'
+
+    def ready(self):
+        from core import search, versions
+        from .models import Feature, Device, DistributorInfo, OfficeAddress
+        from .search import device_documents, feature_documents
+        versions.track(Feature, Device, DistributorInfo, OfficeAddress)
+        search.register(Device, device_documents)
+        search.register(Feature, feature_documents)
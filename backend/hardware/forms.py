@@ -0,0 +1,25 @@
+from django import forms
+from unfold.widgets import UnfoldAdminTextareaWidget
+
+from .models import Device
+
+
+class LinesField(forms.CharField):
+    """A list of strings, edited as one item per line."""
+    widget = UnfoldAdminTextareaWidget
+
+    def prepare_value(self, value):
+        if isinstance(value, list):
+            return '\n'.join(value)
+        return value
+
+    def to_python(self, value):
+        return [line.strip() for line in super().to_python(value).splitlines() if line.strip()]
+
+
+class DeviceAdminForm(forms.ModelForm):
+    specs = LinesField(help_text="One per line")
+
+    class Meta:
+        model = Device
+        fields = '__all__'
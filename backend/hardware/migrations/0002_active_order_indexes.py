@@ -0,0 +1,25 @@
+# Generated by Django 4.2.28 on 2026-10-18 12:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hardware', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='device',
+            index=models.Index(fields=['is_active', 'order'], name='device_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feature',
+            index=models.Index(fields=['is_active', 'order'], name='feature_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='officeaddress',
+            index=models.Index(fields=['is_active', 'order'], name='office_active_order_idx'),
+        ),
+    ]
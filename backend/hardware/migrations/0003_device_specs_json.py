@@ -0,0 +1,35 @@
+from django.db import migrations, models
+
+
+def split_specs(apps, schema_editor):
+    Device = apps.get_model('hardware', 'Device')
+    for device in Device.objects.only('specs_text'):
+        device.specs = [line.strip() for line in device.specs_text.split('\n') if line.strip()]
+        device.save(update_fields=['specs'])
+
+
+def join_specs(apps, schema_editor):
+    Device = apps.get_model('hardware', 'Device')
+    for device in Device.objects.only('specs'):
+        device.specs_text = '\n'.join(device.specs)
+        device.save(update_fields=['specs_text'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hardware', '0002_active_order_indexes'),
+    ]
+
+    operations = [
+        migrations.RenameField(model_name='device', old_name='specs', new_name='specs_text'),
+        # A default lets the column be re-added when migrating backwards
+        migrations.AlterField(model_name='device', name='specs_text', field=models.TextField(default='')),
+        migrations.AddField(
+            model_name='device',
+            name='specs',
+            field=models.JSONField(default=list, help_text='One per line'),
+        ),
+        migrations.RunPython(split_specs, join_specs),
+        migrations.RemoveField(model_name='device', name='specs_text'),
+    ]
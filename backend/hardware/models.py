@@ -1,4 +1,5 @@
 from django.db import models
+from core.models import SingletonModel
 
 class Feature(models.Model):
     icon_choices = [
@@ -15,6 +16,7 @@ class Feature(models.Model):
 
     class Meta:
         ordering = ['order']
+        indexes = [models.Index(fields=['is_active', 'order'], name='feature_active_order_idx')]
 
     def __str__(self):
         return self.title
@@ -29,21 +31,19 @@ class Device(models.Model):
     name = models.CharField(max_length=100)
     tagline = models.CharField(max_length=200)
     image = models.ImageField(upload_to='devices/', blank=True, null=True)
-    specs = models.TextField(help_text="One per line")  # will split by newline
+    specs = models.JSONField(default=list, help_text="One per line")  # list of strings
     icon = models.CharField(max_length=50, choices=icon_choices, default='CameraIcon')
     order = models.PositiveIntegerField(default=0)
     is_active = models.BooleanField(default=True)
 
     class Meta:
         ordering = ['order']
+        indexes = [models.Index(fields=['is_active', 'order'], name='device_active_order_idx')]
 
     def __str__(self):
         return self.name
 
-    def get_specs_list(self):
-        return [s.strip() for s in self.specs.split('\n') if s.strip()]
-
-class DistributorInfo(models.Model):
+class DistributorInfo(SingletonModel):
     heading = models.CharField(max_length=200, default="Sole Distributor of ZK biometric devices in Pakistan")
     description = models.TextField()
     button_text = models.CharField(max_length=50, default="Contact Us for Bulk Orders")
@@ -54,15 +54,6 @@ class DistributorInfo(models.Model):
     class Meta:
         verbose_name_plural = "Distributor Info"
 
-    def save(self, *args, **kwargs):
-        self.pk = 1
-        super().save(*args, **kwargs)
-
-    @classmethod
-    def load(cls):
-        obj, created = cls.objects.get_or_create(pk=1)
-        return obj
-
 class OfficeAddress(models.Model):
     location_name = models.CharField(max_length=100)  # e.g., "United States"
     address_line1 = models.CharField(max_length=255)
@@ -73,6 +64,7 @@ class OfficeAddress(models.Model):
 
     class Meta:
         ordering = ['order']
+        indexes = [models.Index(fields=['is_active', 'order'], name='office_active_order_idx')]
         verbose_name_plural = "Office Addresses"
 
     def __str__(self):
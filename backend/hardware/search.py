@@ -0,0 +1,21 @@
+from core.search import Document
+from .models import Device, Feature
+
+
+def device_documents():
+    for d in Device.objects.filter(is_active=True):
+        specs = ' · '.join(d.specs)
+        yield Document(
+            type='device', id=d.id, title=d.name, url='/hardware',
+            fields=[(d.name, 3), (d.tagline, 2), (specs, 1)],
+            body=f'{d.tagline} · {specs}',
+        )
+
+
+def feature_documents():
+    for f in Feature.objects.filter(is_active=True):
+        yield Document(
+            type='feature', id=f.id, title=f.title, url='/hardware',
+            fields=[(f.title, 3), (f.description, 1)],
+            body=f.description,
+        )
@@ -1,3 +1,43 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from .forms import DeviceAdminForm
+from .models import Device
+
+
+class DeviceSpecsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Device.objects.create(name="F22", tagline="Compact", specs=["Fingerprint sensor", "RFID"], order=1)
+        Device.objects.create(name="SpeedFace", tagline="Face", specs=["Face recognition"], order=2)
+
+    def test_specs_are_copied_as_stored(self):
+        devices = self.client.get(reverse('hardware')).json()['devices']
+        self.assertEqual([d['specs'] for d in devices], [["Fingerprint sensor", "RFID"], ["Face recognition"]])
+
+    def test_filter_by_spec(self):
+        devices = self.client.get(reverse('hardware'), {'spec': 'fingerprint'}).json()['devices']
+        self.assertEqual([d['name'] for d in devices], ["F22"])
+        self.assertEqual(len(self.client.get(reverse('hardware'), {'spec': ' '}).json()['devices']), 2)
+
+    def test_admin_edits_specs_one_per_line(self):
+        device = Device.objects.get(name="F22")
+        form = DeviceAdminForm(instance=device)
+        self.assertIn("Fingerprint sensor\nRFID", form['specs'].as_widget())
+        data = {
+            'name': "F22", 'tagline': "Compact", 'icon': 'CameraIcon', 'order': 1, 'is_active': True,
+            'specs': " Fingerprint sensor \r\n\r\nWi-Fi\r\n",
+        }
+        form = DeviceAdminForm(data, instance=device)
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+        device.refresh_from_db()
+        self.assertEqual(device.specs, ["Fingerprint sensor", "Wi-Fi"])
+        self.assertFalse(DeviceAdminForm({**data, 'specs': "\n"}, instance=device).is_valid())
+
+    def test_admin_search_matches_specs(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        response = self.client.get(reverse('admin:hardware_device_changelist'), {'q': 'fingerprint'})
+        self.assertEqual(response.context['cl'].result_count, 1)
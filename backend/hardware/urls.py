@@ -1,6 +1,7 @@
 from django.urls import path
+from core.views import api_view
 from . import views
 
 urlpatterns = [
-    path('api/hardware/', views.HardwareView.as_view(), name='hardware'),
-]
\ No newline at end of file
+    path('api/hardware/', api_view(views.HardwareView, views.HardwareAsyncView), name='hardware'),
+]
@@ -1,52 +1,69 @@
-from django.http import JsonResponse
+from django.db.models import F
+from django.http import HttpResponse
+from core.cache import acached_json, cached_json
+from core.http import JsonResponse, attach_media
 from django.views import View
+from core.models import ImageDerivative
+from core.views import ConditionalGetMixin, gather_sections
 from .models import Feature, Device, DistributorInfo, OfficeAddress
 
-class HardwareView(View):
+class HardwareView(ConditionalGetMixin, View):
+    depends_on = (Feature, Device, DistributorInfo, OfficeAddress, ImageDerivative)
+    payload_name = 'hardware'
+
     def get(self, request):
-        # Features
-        features = []
-        for f in Feature.objects.filter(is_active=True).order_by('order'):
-            features.append({
-                'icon': f.icon,
-                'title': f.title,
-                'desc': f.description,
-            })
-
-        # Devices
-        devices = []
-        for d in Device.objects.filter(is_active=True).order_by('order'):
-            devices.append({
-                'name': d.name,
-                'tagline': d.tagline,
-                'image': d.image.url if d.image else None,
-                'specs': d.get_specs_list(),
-                'icon': d.icon,
-            })
-
-        # Distributor info
+        if request.GET.get('spec'):
+            return JsonResponse(self.build())
+        body = cached_json(self.payload_name, self.depends_on, self.build)
+        return HttpResponse(body, content_type='application/json')
+
+    def build(self):
+        return {name: section() for name, section in self.get_sections().items()}
+
+    def get_sections(self):
+        """Independent parts of the payload, in output order."""
+        return {
+            'features': self.get_features,
+            'devices': self.get_devices,
+            'distributor': self.get_distributor,
+            'offices': self.get_offices,
+        }
+
+    def get_features(self):
+        return list(Feature.objects.filter(is_active=True).order_by('order')
+                    .values('icon', 'title', desc=F('description')))
+
+    def get_devices(self):
+        """Active devices; ``?spec=fingerprint`` keeps those with a matching spec."""
+        devices = Device.objects.filter(is_active=True)
+        spec = self.request.GET.get('spec', '').strip()
+        if spec:
+            devices = devices.filter(specs__icontains=spec)
+        rows = list(devices.order_by('order').values('name', 'tagline', 'image', 'specs', 'icon'))
+        return attach_media(rows, 'image')
+
+    def get_distributor(self):
         dist = DistributorInfo.load()
-        distributor = {
+        return {
             'heading': dist.heading,
             'description': dist.description,
             'button_text': dist.button_text,
             'button_link': dist.button_link,
         }
 
-        # Office addresses
-        offices = []
-        for o in OfficeAddress.objects.filter(is_active=True).order_by('order'):
-            offices.append({
-                'location_name': o.location_name,
-                'address_line1': o.address_line1,
-                'address_line2': o.address_line2,
-                'city_state_zip': o.city_state_zip,
-            })
-
-        data = {
-            'features': features,
-            'devices': devices,
-            'distributor': distributor,
-            'offices': offices,
-        }
-        return JsonResponse(data)
\ No newline at end of file
+    def get_offices(self):
+        return list(OfficeAddress.objects.filter(is_active=True).order_by('order')
+                    .values('location_name', 'address_line1', 'address_line2', 'city_state_zip'))
+
+
+class HardwareAsyncView(HardwareView):
+    """ASGI version: the four sections are queried concurrently."""
+
+    async def get(self, request):
+        if request.GET.get('spec'):
+            return JsonResponse(await self.abuild())
+        body = await acached_json(self.payload_name, self.depends_on, self.abuild)
+        return HttpResponse(body, content_type='application/json')
+
+    async def abuild(self):
+        return await gather_sections(self.get_sections())
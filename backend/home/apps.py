@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class HomeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'home'
+
+    def ready(self):
+        from core import search, versions
+        from .models import (
+            HeroSection, WhyChooseFeature, AppFeature,
+            Stat, Testimonial, Certification, Award
+        )
+        from .search import testimonial_documents
+        versions.track(
+            HeroSection, WhyChooseFeature, AppFeature,
+            Stat, Testimonial, Certification, Award
+        )
+        search.register(Testimonial, testimonial_documents)
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.28 on 2026-10-18 12:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='appfeature',
+            index=models.Index(fields=['is_active', 'order'], name='appfeature_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='award',
+            index=models.Index(fields=['is_active', 'order'], name='award_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='certification',
+            index=models.Index(fields=['is_active', 'order'], name='cert_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stat',
+            index=models.Index(fields=['is_active', 'order'], name='stat_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testimonial',
+            index=models.Index(fields=['is_active', 'order'], name='testimonial_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='whychoosefeature',
+            index=models.Index(fields=['is_active', 'order'], name='whychoose_active_order_idx'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
+from core.models import SingletonModel
 
-class HeroSection(models.Model):
+class HeroSection(SingletonModel):
     heading = models.CharField(max_length=200)
     description = models.TextField()
     primary_button_text = models.CharField(max_length=50, default="Request a Demo")
@@ -15,16 +16,6 @@ class HeroSection(models.Model):
         verbose_name = "Hero Section"
         verbose_name_plural = "Hero Section"
 
-    def save(self, *args, **kwargs):
-        # Ensure only one hero section exists
-        self.pk = 1
-        super().save(*args, **kwargs)
-
-    @classmethod
-    def load(cls):
-        obj, created = cls.objects.get_or_create(pk=1)
-        return obj
-
 class WhyChooseFeature(models.Model):
     title = models.CharField(max_length=100)
     order = models.PositiveIntegerField(default=0)
@@ -32,6 +23,7 @@ class WhyChooseFeature(models.Model):
 
     class Meta:
         ordering = ['order']
+        indexes = [models.Index(fields=['is_active', 'order'], name='whychoose_active_order_idx')]
 
     def __str__(self):
         return self.title
@@ -43,6 +35,7 @@ class AppFeature(models.Model):
 
     class Meta:
         ordering = ['order']
+        indexes = [models.Index(fields=['is_active', 'order'], name='appfeature_active_order_idx')]
 
     def __str__(self):
         return self.description[:50]
@@ -55,6 +48,7 @@ class Stat(models.Model):
 
     class Meta:
         ordering = ['order']
+        indexes = [models.Index(fields=['is_active', 'order'], name='stat_active_order_idx')]
 
     def __str__(self):
         return f"{self.value} {self.label}"
@@ -69,6 +63,7 @@ class Testimonial(models.Model):
 
     class Meta:
         ordering = ['order']
+        indexes = [models.Index(fields=['is_active', 'order'], name='testimonial_active_order_idx')]
 
     def __str__(self):
         return self.author_name
@@ -81,6 +76,7 @@ class Certification(models.Model):
 
     class Meta:
         ordering = ['order']
+        indexes = [models.Index(fields=['is_active', 'order'], name='cert_active_order_idx')]
 
     def __str__(self):
         return self.name
@@ -93,6 +89,7 @@ class Award(models.Model):
 
     class Meta:
         ordering = ['order']
+        indexes = [models.Index(fields=['is_active', 'order'], name='award_active_order_idx')]
 
     def __str__(self):
         return self.name
\ No newline at end of file
@@ -0,0 +1,11 @@
+from core.search import Document
+from .models import Testimonial
+
+
+def testimonial_documents():
+    for t in Testimonial.objects.filter(is_active=True):
+        yield Document(
+            type='testimonial', id=t.id, title=t.author_name, url='/',
+            fields=[(t.quote, 1), (t.author_name, 2)],
+            body=t.quote,
+        )
@@ -1,3 +1,47 @@
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from clients.models import Client
+from .models import HeroSection, Stat
+
+
+class HomePageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        HeroSection.objects.create(heading="Welcome", description="HR made simple")
+        Stat.objects.create(value="1,300+", label="ORGANIZATIONS", order=1)
+        Client.objects.create(name="Acme")
+        self.url = reverse('home')
+
+    def test_cache_hit_runs_no_queries(self):
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second.json()['hero']['heading'], "Welcome")
+
+    def test_save_invalidates_payload(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Stat.objects.create(value="24/7", label="SUPPORT", order=2)
+        response = self.client.get(self.url)
+        self.assertEqual(
+            [s['value'] for s in response.json()['stats']], ["1,300+", "24/7"]
+        )
+
+    def test_client_delete_invalidates_payload(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Client.objects.all().delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response.json()['clients'], [])
+
+    def test_etag_is_weak(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        site = self.client.get(reverse('site'), {'sections': 'home'})
+        self.assertTrue(site['ETag'].startswith('W/"'))
+        self.assertFalse(self.client.get(reverse('site'), {'sections': 'contact'})['ETag'].startswith('W/'))
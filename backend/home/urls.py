@@ -1,6 +1,7 @@
 from django.urls import path
+from core.views import api_view
 from . import views
 
 urlpatterns = [
-    path('api/home/', views.HomePageView.as_view(), name='home'),
-]
\ No newline at end of file
+    path('api/home/', api_view(views.HomePageView, views.HomePageAsyncView), name='home'),
+]
@@ -1,16 +1,61 @@
-from django.http import JsonResponse
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
 from django.views import View
+from core.cache import acached_json, cached_json
+from core.http import attach_media
+from core.images import get_srcsets
+from core.models import ImageDerivative
+from core.views import ConditionalGetMixin, gather_sections
 from .models import (
     HeroSection, WhyChooseFeature, AppFeature,
     Stat, Testimonial, Certification, Award
 )
 from clients.models import Client  # reuse client logos for the strip
+from clients.sampler import client_pool
+
+class HomePageView(ConditionalGetMixin, View):
+    depends_on = (
+        HeroSection, WhyChooseFeature, AppFeature,
+        Stat, Testimonial, Certification, Award, Client, ImageDerivative,
+    )
+
+    payload_name = 'home'
+    client_strip_size = 6
+    # Same stamps, different client strip: equivalent but not identical bodies
+    weak_etag = True
 
-class HomePageView(View):
     def get(self, request):
+        # The cached body is shared by every request; only the client strip
+        # is drawn per request and spliced in as the last key.
+        body = cached_json(self.payload_name, self.depends_on, self.build)
+        return self.render(body, client_pool.sample_json(self.client_strip_size))
+
+    def render(self, body, clients):
+        return HttpResponse(
+            body[:-1] + b',"clients":' + clients + b'}',
+            content_type='application/json',
+        )
+
+    def get_sections(self):
+        """Independent parts of the payload, in output order."""
+        return {
+            'hero': self.get_hero,
+            'why_choose_features': self.get_why_choose_features,
+            'app_features': self.get_app_features,
+            'stats': self.get_stats,
+            'testimonials': self.get_testimonials,
+            'certifications': self.get_certifications,
+            'awards': self.get_awards,
+        }
+
+    def build(self):
+        return {name: section() for name, section in self.get_sections().items()}
+
+    def get_hero(self):
         # Hero section (singleton)
         hero = HeroSection.load()
-        hero_data = {
+        srcsets = get_srcsets([hero.background_image])
+        return {
             'heading': hero.heading,
             'description': hero.description,
             'primary_button_text': hero.primary_button_text,
@@ -18,64 +63,51 @@ class HomePageView(View):
             'secondary_button_text': hero.secondary_button_text,
             'secondary_button_link': hero.secondary_button_link,
             'background_image': hero.background_image.url if hero.background_image else None,
+            'background_image_srcset': srcsets.get(hero.background_image.name),
         }
 
-        # Why choose features
-        why_choose = list(WhyChooseFeature.objects.filter(is_active=True)
-                          .order_by('order').values_list('title', flat=True))
-
-        # App features
-        app_features = list(AppFeature.objects.filter(is_active=True)
-                            .order_by('order').values_list('description', flat=True))
-
-        # Stats
-        stats = list(Stat.objects.filter(is_active=True)
-                     .order_by('order').values('value', 'label'))
-
-        # Testimonials
-        testimonials = []
-        for t in Testimonial.objects.filter(is_active=True).order_by('order'):
-            testimonials.append({
-                'quote': t.quote,
-                'author_name': t.author_name,
-                'author_title': t.author_title,
-                'author_image': t.author_image.url if t.author_image else None,
-            })
-
-        # Certifications
-        certifications = []
-        for c in Certification.objects.filter(is_active=True).order_by('order'):
-            certifications.append({
-                'name': c.name,
-                'image': c.image.url,
-            })
-
-        # Awards
-        awards = []
-        for a in Award.objects.filter(is_active=True).order_by('order'):
-            awards.append({
-                'name': a.name,
-                'image': a.image.url,
-            })
-
-        clients = []
-        for client in Client.objects.filter(is_active=True).order_by('?')[:6]:
-            clients.append({
-                'name': client.name,
-                'logo': client.logo.url if client.logo else None,
-            })
-
-        data = {
-            'hero': hero_data,
-            'why_choose_features': why_choose,
-            'app_features': app_features,
-            'stats': stats,
-            'testimonials': testimonials,
-            'certifications': certifications,
-            'awards': awards,
-            'clients': clients,
-        }
-        return JsonResponse(data)
+    def get_why_choose_features(self):
+        return list(WhyChooseFeature.objects.filter(is_active=True)
+                    .order_by('order').values_list('title', flat=True))
+
+    def get_app_features(self):
+        return list(AppFeature.objects.filter(is_active=True)
+                    .order_by('order').values_list('description', flat=True))
+
+    def get_stats(self):
+        return list(Stat.objects.filter(is_active=True)
+                    .order_by('order').values('value', 'label'))
+
+    def get_testimonials(self):
+        return attach_media(
+            list(Testimonial.objects.filter(is_active=True).order_by('order')
+                 .values('quote', 'author_name', 'author_title', 'author_image')),
+            'author_image',
+        )
+
+    def get_certifications(self):
+        return attach_media(
+            list(Certification.objects.filter(is_active=True).order_by('order').values('name', 'image')),
+            'image',
+        )
+
+    def get_awards(self):
+        return attach_media(
+            list(Award.objects.filter(is_active=True).order_by('order').values('name', 'image')),
+            'image',
+        )
+
+
+class HomePageAsyncView(HomePageView):
+    """ASGI version: the sections of a cache miss are queried concurrently."""
+
+    async def get(self, request):
+        body = await acached_json(self.payload_name, self.depends_on, self.abuild)
+        clients = await sync_to_async(client_pool.sample_json)(self.client_strip_size)
+        return self.render(body, clients)
+
+    async def abuild(self):
+        return await gather_sections(self.get_sections())
 
 
 def dashboard_callback(request, context):
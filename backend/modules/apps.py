@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class ModulesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'modules'
+
+    def ready(self):
+        from core import search, versions
+        from .models import Module
+        from .search import module_documents
+        versions.track(Module)
+        search.register(Module, module_documents)
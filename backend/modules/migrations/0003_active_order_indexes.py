@@ -0,0 +1,17 @@
+# Generated by Django 4.2.28 on 2026-10-18 12:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('modules', '0002_add_icon_name_field'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='module',
+            index=models.Index(fields=['is_active', 'order', 'name'], name='module_active_order_idx'),
+        ),
+    ]
@@ -26,4 +26,5 @@ class Module(models.Model):
         return self.name
 
     class Meta:
-        ordering = ['order', 'name']
\ No newline at end of file
+        ordering = ['order', 'name']
+        indexes = [models.Index(fields=['is_active', 'order', 'name'], name='module_active_order_idx')]
\ No newline at end of file
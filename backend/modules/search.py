@@ -0,0 +1,14 @@
+from core.search import Document, html_to_text
+from .models import Module
+
+
+def module_documents():
+    for m in Module.objects.filter(is_active=True).only(
+        'id', 'name', 'slug', 'hero_description', 'content'
+    ):
+        content = html_to_text(m.content)
+        yield Document(
+            type='module', id=m.id, title=m.name, url=f'/modules/{m.slug}',
+            fields=[(m.name, 3), (m.hero_description, 2), (content, 1)],
+            body=f'{m.hero_description} {content}',
+        )
@@ -1,3 +1,74 @@
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
-# Create your tests here.
+from .models import Module
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Module.objects.create(
+            name="Payroll", hero_heading="Payroll", hero_description="Pay people",
+            content="<p>Body</p>", icon_name="BanknotesIcon",
+        )
+        self.url = reverse('module-list')
+
+    def test_response_carries_validators(self):
+        response = self.client.get(self.url)
+        self.assertTrue(response.has_header('ETag'))
+        self.assertTrue(response.has_header('Last-Modified'))
+
+    def test_matching_etag_gets_304_without_queries(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_matching_last_modified_gets_304(self):
+        last_modified = self.client.get(self.url)['Last-Modified']
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_change_invalidates_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            module = Module.objects.get()
+            module.name = "Payroll & Tax"
+            module.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['name'], "Payroll & Tax")
+
+
+class ModuleListFieldsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Module.objects.create(
+            name="Payroll", hero_heading="Payroll", hero_description="Pay people",
+            content="<p>Body</p>", icon_name="BanknotesIcon",
+        )
+        self.url = reverse('module-list')
+
+    def test_default_projection_leaves_out_content(self):
+        with CaptureQueriesContext(connection) as queries:
+            module = self.client.get(self.url).json()[0]
+        self.assertNotIn('content', module)
+        self.assertEqual(module['slug'], 'payroll')
+        self.assertIsNone(module['featured_image'])
+        self.assertNotIn('content', queries[0]['sql'])
+
+    def test_fields_parameter(self):
+        response = self.client.get(self.url, {'fields': 'name,content'})
+        self.assertEqual(response.json(), [{'name': "Payroll", 'content': "<p>Body</p>"}])
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(self.url, {'fields': 'name,secret'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_empty_field_list_is_rejected(self):
+        response = self.client.get(self.url, {'fields': ' , '})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': "No fields requested"})
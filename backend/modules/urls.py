@@ -1,7 +1,8 @@
 from django.urls import path
+from core.views import api_view
 from . import views
 
 urlpatterns = [
-    path('api/modules/', views.ModuleListView.as_view(), name='module-list'),
-    path('api/modules/<slug:slug>/', views.ModuleDetailView.as_view(), name='module-detail'),
-]
\ No newline at end of file
+    path('api/modules/', api_view(views.ModuleListView, views.ModuleListAsyncView), name='module-list'),
+    path('api/modules/<slug:slug>/', api_view(views.ModuleDetailView, views.ModuleDetailAsyncView), name='module-detail'),
+]
@@ -1,41 +1,121 @@
 import json
-from django.http import JsonResponse
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from core.cache import acached_json, cached_json
+from core.http import JsonResponse, attach_media
 from django.views import View
 from django.core.serializers import serialize
+from core.models import ImageDerivative
+from core.views import ConditionalGetMixin
 from .models import Module
 
-class ModuleListView(View):
+class ModuleListView(ConditionalGetMixin, View):
+    """
+    Active modules. ``?fields=name,slug,...`` picks the keys to return; by
+    default everything except the full ``content`` body, which is never
+    fetched from the database unless asked for (use ModuleDetailView).
+    """
+    depends_on = (Module, ImageDerivative)
+
+    # Output key -> model columns it needs
+    fields = {
+        'id': ('id',),
+        'name': ('name',),
+        'slug': ('slug',),
+        'hero_heading': ('hero_heading',),
+        'hero_description': ('hero_description',),
+        'content': ('content',),
+        'featured_image': ('featured_image',),
+        'featured_image_srcset': ('featured_image',),
+        'icon_name': ('icon_name',),
+        'order': ('order',),
+    }
+    default_fields = [f for f in fields if f != 'content']
+    # The default projection is cached, custom ?fields= ones are not
+    payload_name = 'modules'
+
     def get(self, request):
-        modules = Module.objects.filter(is_active=True).order_by('order', 'name')
-        data = []
-        for module in modules:
-            data.append({
-                'id': module.id,
-                'name': module.name,
-                'slug': module.slug,
-                'hero_heading': module.hero_heading,
-                'hero_description': module.hero_description,
-                'content': module.content,
-                'featured_image': module.featured_image.url if module.featured_image else None,
-                'icon_name': module.icon_name,         
-                'order': module.order,
-            })
-        return JsonResponse(data, safe=False)
-
-class ModuleDetailView(View):
+        try:
+            keys = self.get_keys(request)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        if keys is not self.default_fields:
+            return JsonResponse(self.build(keys), safe=False)
+        body = cached_json(self.payload_name, self.depends_on, lambda: self.build(keys))
+        return HttpResponse(body, content_type='application/json')
+
+    def build(self, keys):
+        return self.serialize(list(self.get_queryset(keys)), keys)
+
+    def get_keys(self, request):
+        requested = request.GET.get('fields')
+        if not requested:
+            return self.default_fields
+        keys = [f.strip() for f in requested.split(',') if f.strip()]
+        if not keys:
+            # .values() without columns would select them all, content included
+            raise ValueError("No fields requested")
+        unknown = [f for f in keys if f not in self.fields]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return keys
+
+    def get_queryset(self, keys):
+        columns = list(dict.fromkeys(c for key in keys for c in self.fields[key]))
+        return (Module.objects.filter(is_active=True)
+                .order_by('order', 'name').values(*columns))
+
+    def serialize(self, rows, keys):
+        if 'featured_image' in keys or 'featured_image_srcset' in keys:
+            rows = attach_media(rows, 'featured_image', srcsets='featured_image_srcset' in keys)
+        return [{key: row[key] for key in keys} for row in rows]
+
+class ModuleListAsyncView(ModuleListView):
+    async def get(self, request):
+        try:
+            keys = self.get_keys(request)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        if keys is not self.default_fields:
+            return JsonResponse(await self.abuild(keys), safe=False)
+        body = await acached_json(self.payload_name, self.depends_on, lambda: self.abuild(keys))
+        return HttpResponse(body, content_type='application/json')
+
+    async def abuild(self, keys):
+        rows = [row async for row in self.get_queryset(keys)]
+        return await sync_to_async(self.serialize)(rows, keys)
+
+class ModuleDetailView(ConditionalGetMixin, View):
+    depends_on = (Module, ImageDerivative)
+    columns = (
+        'id', 'name', 'slug', 'hero_heading', 'hero_description',
+        'content', 'featured_image', 'order',
+    )
+
     def get(self, request, slug):
         try:
-            module = Module.objects.get(slug=slug, is_active=True)
-            data = {
-                'id': module.id,
-                'name': module.name,
-                'slug': module.slug,
-                'hero_heading': module.hero_heading,
-                'hero_description': module.hero_description,
-                'content': module.content,
-                'featured_image': module.featured_image.url if module.featured_image else None,
-                'order': module.order,
-            }
-            return JsonResponse(data)
+            body = cached_json(f'module:{slug}', self.depends_on, lambda: self.build(slug))
         except Module.DoesNotExist:
-            return JsonResponse({'error': 'Module not found'}, status=404)
\ No newline at end of file
+            return JsonResponse({'error': 'Module not found'}, status=404)
+        return HttpResponse(body, content_type='application/json')
+
+    def build(self, slug):
+        return self.serialize(self.get_queryset(slug).get())
+
+    def get_queryset(self, slug):
+        return Module.objects.filter(slug=slug, is_active=True).values(*self.columns)
+
+    def serialize(self, row):
+        return attach_media([row], 'featured_image')[0]
+
+class ModuleDetailAsyncView(ModuleDetailView):
+    async def get(self, request, slug):
+        try:
+            body = await acached_json(f'module:{slug}', self.depends_on, lambda: self.abuild(slug))
+        except Module.DoesNotExist:
+            return JsonResponse({'error': 'Module not found'}, status=404)
+        return HttpResponse(body, content_type='application/json')
+
+    async def abuild(self, slug):
+        module = await self.get_queryset(slug).aget()
+        return await sync_to_async(self.serialize)(module)